@@ -9,13 +9,13 @@ if __name__ == "__main__":
     output_file = "output/admissibles_paris_2024.csv"
 
     try:
-        extract_admissibles_from_pdf(
+        result = extract_admissibles_from_pdf(
             pdf_path=pdf_file,
             output_csv_path=output_file,
             departement="75",
             session_date="2024-01-15",
         )
-        print(f"✅ Extraction réussie vers {output_file}")
+        print(f"✅ Extraction réussie vers {output_file} ({result.total} admissibles)")
 
     except FileNotFoundError:
         print(f"❌ Le fichier PDF {pdf_file} n'a pas été trouvé")
@@ -12,13 +12,19 @@ setup(
     python_requires=">=3.8",
     install_requires=[
         "pdfplumber>=0.10.0",
+        "pymupdf>=1.23.0",
         "pandas>=2.0.0",
+        "pyarrow>=14.0.0",
         "typer>=0.9.0",
         "requests>=2.31.0",
     ],
+    extras_require={
+        # Cache disque des réponses d'enrichissement (optionnel)
+        "cache": ["diskcache>=5.6"],
+    },
     entry_points={
         "console_scripts": [
-            "agent-secret-adl=agent_secret_adl.__main__:app",
+            "agent-secret-adl=agent_secret_adl.cli:app",
         ],
     },
 )
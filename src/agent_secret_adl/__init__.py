@@ -1,8 +1,18 @@
 """Agent Secret ADL - Extraction et enrichissement de candidatures TAXIS/VTC."""
 
+import importlib
+
 __version__ = "0.1.0"
 __author__ = "AGENT_SECRET_ADL"
 
-from . import config, extraction, normalization, enrichment, reporting
-
 __all__ = ["config", "extraction", "normalization", "enrichment", "reporting"]
+
+
+def __getattr__(name: str):
+    """Importe les sous-modules à la demande (pandas, pdfplumber... ne sont
+    chargés que par le code qui les utilise)."""
+    if name in __all__:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,6 @@
 """Point d'entrée CLI pour AGENT_SECRET_ADL."""
 
-from agent_secret_adl.cli import main
+from agent_secret_adl.cli import app
 
 if __name__ == "__main__":
-    main()
+    app()
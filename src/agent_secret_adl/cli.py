@@ -2,20 +2,23 @@
 
 import logging
 import sys
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import pandas as pd
 import typer
-from rich.console import Console
-from rich.table import Table
 
-from agent_secret_adl.extraction import extract_admissibles_from_pdf
-from agent_secret_adl.enrichment import enrich_with_hunter
-from agent_secret_adl.enrichment.phones import enrich_with_phones
-from agent_secret_adl.enrichment.prod_mobile import MobileEnricher
+from agent_secret_adl.config import EXTRACTION_CONFIG
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from rich.console import Console
+
+# Les imports lourds (pandas, rich, modules d'extraction/enrichissement)
+# sont faits dans les commandes qui en ont besoin : --help et info
+# restent rapides.
 
 # Configuration
-console = Console()
 app = typer.Typer(
     name="agent-secret-adl",
     help="🚕 AGENT_SECRET_ADL - Extraction de candidats TAXIS/VTC",
@@ -24,6 +27,35 @@ app = typer.Typer(
 # Logger
 logger = logging.getLogger(__name__)
 
+# Nombre de lignes affichées dans les aperçus
+PREVIEW_ROWS = 5
+
+
+@lru_cache(maxsize=None)
+def _get_console() -> "Console":
+    """Retourne la console rich partagée (créée au premier appel)."""
+    from rich.console import Console
+
+    return Console()
+
+
+def _preview_records(df: "pd.DataFrame", n: int = PREVIEW_ROWS) -> list:
+    """
+    Extrait les n premières lignes d'un DataFrame pour l'aperçu rich.
+
+    Seul df.head(n) est converti (pas de Series par ligne) et les valeurs
+    manquantes deviennent None pour l'affichage.
+
+    Args:
+        df: DataFrame à prévisualiser.
+        n: Nombre de lignes.
+
+    Returns:
+        Liste de dictionnaires (une entrée par ligne).
+    """
+    head = df.head(n).astype(object)
+    return head.where(head.notna(), None).to_dict("records")
+
 
 @app.command("extract-admissibles")
 def extract_admissibles(
@@ -51,6 +83,24 @@ def extract_admissibles(
         help="Date de la session (ex: 2025-02-25)",
         metavar="DATE",
     ),
+    num_workers: int = typer.Option(
+        EXTRACTION_CONFIG["num_workers"],
+        "--num-workers",
+        help="Nombre de processus pour l'extraction des pages PDF",
+        metavar="INT",
+    ),
+    backend: str = typer.Option(
+        EXTRACTION_CONFIG["backend"],
+        "--backend",
+        help="Moteur d'extraction de texte (pymupdf, pdfplumber)",
+        metavar="STR",
+    ),
+    output_format: str = typer.Option(
+        None,
+        "--format",
+        help="Format de sortie (csv, parquet, feather) ; défaut : déduit de l'extension",
+        metavar="STR",
+    ),
     verbose: bool = typer.Option(
         False,
         "--verbose",
@@ -68,6 +118,12 @@ def extract_admissibles(
           --departement 78 \\
           --session-date 2025-02-25
     """
+    from rich.table import Table
+
+    from agent_secret_adl.extraction import extract_admissibles_from_pdf
+
+    console = _get_console()
+
     # Configuration du logging
     log_level = logging.DEBUG if verbose else logging.INFO
     logging.basicConfig(
@@ -83,39 +139,30 @@ def extract_admissibles(
     console.print()
 
     try:
-        # Validation des chemins
-        pdf_path_obj = Path(pdf_path)
-        output_csv_obj = Path(output_csv)
-
-        if not pdf_path_obj.exists():
-            console.print(
-                f"[bold red]❌ Erreur :[/bold red] Le fichier PDF n'existe pas"
-            )
-            console.print(f"   Chemin fourni : {pdf_path}")
-            raise typer.Exit(code=1)
-
         # Afficher les paramètres
         console.print("[bold]Paramètres :[/bold]")
         console.print(f"  📄 PDF           : {pdf_path}")
         console.print(f"  💾 Sortie        : {output_csv}")
         console.print(f"  📍 Département   : {departement}")
         console.print(f"  📅 Session       : {session_date}")
+        console.print(f"  ⚙️  Workers       : {num_workers}")
+        console.print(f"  🔧 Backend       : {backend}")
         console.print()
 
         # Lancer l'extraction
         console.print("[bold]⏳ Extraction en cours...[/bold]")
-        extract_admissibles_from_pdf(
+        result = extract_admissibles_from_pdf(
             pdf_path=pdf_path,
             output_csv_path=output_csv,
             departement=departement,
             session_date=session_date,
+            num_workers=num_workers,
+            backend=backend,
+            output_format=output_format,
         )
 
-        # Charger et afficher les résultats
-        df = pd.read_csv(output_csv)
-
         # Statistiques par catégorie
-        stats_by_category = df["categorie"].value_counts().to_dict()
+        stats_by_category = result.stats_by_category
 
         console.print()
         console.print("[bold green]✅ Extraction réussie ![/bold green]")
@@ -126,7 +173,7 @@ def extract_admissibles(
         table.add_column("Métrique", style="cyan", width=25)
         table.add_column("Valeur", style="green", width=20)
 
-        table.add_row("Total candidats", str(len(df)))
+        table.add_row("Total candidats", str(result.total))
         for category, count in sorted(stats_by_category.items()):
             table.add_row(f"  ↳ {category}", str(count))
         table.add_row("Fichier généré", str(output_csv))
@@ -135,7 +182,7 @@ def extract_admissibles(
         console.print()
 
         # Afficher un aperçu des données
-        if len(df) > 0:
+        if result.total > 0:
             console.print("[bold]📝 Aperçu des données (5 premiers enregistrements) :[/bold]")
             console.print()
 
@@ -145,7 +192,7 @@ def extract_admissibles(
             preview_table.add_column("Prénom", style="blue")
             preview_table.add_column("NOM", style="blue")
 
-            for _, row in df.head(5).iterrows():
+            for row in result.candidates[:PREVIEW_ROWS]:
                 preview_table.add_row(
                     row["categorie"],
                     str(row["numero_candidat"]),
@@ -184,6 +231,10 @@ def extract_admissibles(
 @app.command("info")
 def info() -> None:
     """Affiche les informations du projet."""
+    from rich.table import Table
+
+    console = _get_console()
+
     console.print()
     console.print("[bold cyan]ℹ️  AGENT_SECRET_ADL - Informations[/bold cyan]")
     console.print()
@@ -229,6 +280,12 @@ def enrich_hunter(
         help="Nombre maximum de candidats à enrichir (limitation API)",
         metavar="INT",
     ),
+    output_format: str = typer.Option(
+        None,
+        "--format",
+        help="Format de sortie (csv, parquet, feather) ; défaut : déduit de l'extension",
+        metavar="STR",
+    ),
     verbose: bool = typer.Option(
         False,
         "--verbose",
@@ -248,6 +305,12 @@ def enrich_hunter(
           --output-csv output/admissibles_enrichis.csv \\
           --max-rows 20
     """
+    from rich.table import Table
+
+    from agent_secret_adl.enrichment import enrich_with_hunter
+
+    console = _get_console()
+
     # Configuration du logging
     log_level = logging.DEBUG if verbose else logging.INFO
     logging.basicConfig(
@@ -263,15 +326,9 @@ def enrich_hunter(
     console.print()
 
     try:
-        # Validation des chemins
-        input_csv_obj = Path(input_csv)
-
-        if not input_csv_obj.exists():
-            console.print(
-                f"[bold red]❌ Erreur :[/bold red] Le fichier CSV n'existe pas"
-            )
-            console.print(f"   Chemin fourni : {input_csv}")
-            raise typer.Exit(code=1)
+        # Valider les paramètres
+        if max_rows < 1:
+            raise ValueError("max_rows doit être >= 1")
 
         # Afficher les paramètres
         console.print("[bold]Paramètres :[/bold]")
@@ -283,31 +340,31 @@ def enrich_hunter(
 
         # Lancer l'enrichissement
         console.print("[bold]⏳ Enrichissement en cours...[/bold]")
-        enrich_with_hunter(
+        df = enrich_with_hunter(
             input_csv_path=input_csv,
             output_csv_path=output_csv,
             api_key=api_key,
             max_rows=max_rows,
+            output_format=output_format,
         )
 
-        # Charger et afficher les résultats
-        df = pd.read_csv(output_csv)
-
         console.print()
         console.print("[bold green]✅ Enrichissement réussi ![/bold green]")
         console.print()
 
         # Statistiques d'enrichissement
-        enriched_count = (df["enrichment_status"] == "simulated").sum()
-        skipped_count = (df["enrichment_status"] == "skipped").sum()
-        error_count = (df["enrichment_status"] == "error").sum()
+        rows_skipped = df.attrs.get("rows_skipped", 0)
+        status_counts = df["enrichment_status"].value_counts()
+        enriched_count = status_counts.get("simulated", 0)
+        skipped_count = status_counts.get("skipped", 0) + rows_skipped
+        error_count = status_counts.get("error", 0)
 
         # Tableau de résumé
         table = Table(title="📊 Résumé d'enrichissement", show_header=True)
         table.add_column("Métrique", style="cyan", width=25)
         table.add_column("Valeur", style="green", width=20)
 
-        table.add_row("Total lignes", str(len(df)))
+        table.add_row("Total lignes", str(len(df) + rows_skipped))
         table.add_row("Enrichis (simulé)", str(enriched_count))
         table.add_row("Non traités", str(skipped_count))
         if error_count > 0:
@@ -330,12 +387,12 @@ def enrich_hunter(
             preview_table.add_column("Email simulé", style="yellow")
             preview_table.add_column("Statut", style="cyan")
 
-            for _, row in df.head(5).iterrows():
+            for row in _preview_records(df):
                 email = row.get("email", "N/A")
-                status = row.get("enrichment_status", "unknown")
+                status = row.get("enrichment_status") or "unknown"
                 preview_table.add_row(
-                    row["prenom"],
-                    row["nom"],
+                    row["prenom"] or "",
+                    row["nom"] or "",
                     str(email) if email else "N/A",
                     status,
                 )
@@ -388,6 +445,12 @@ def enrich_phones(
         help="Nombre max de candidats à traiter (contrôle de charge)",
         metavar="INT",
     ),
+    output_format: str = typer.Option(
+        None,
+        "--format",
+        help="Format de sortie (csv, parquet, feather) ; défaut : déduit de l'extension",
+        metavar="STR",
+    ),
     verbose: bool = typer.Option(
         False,
         "--verbose",
@@ -411,6 +474,13 @@ def enrich_phones(
             --output-csv output/admissibles_complete.csv \\
             --max-rows 50
     """
+    from rich.table import Table
+
+    from agent_secret_adl.enrichment import enrich_with_phones
+    from agent_secret_adl.tabular import TABLE_SUFFIXES
+
+    console = _get_console()
+
     # Configuration logging
     if verbose:
         logging.basicConfig(
@@ -439,11 +509,10 @@ def enrich_phones(
             raise ValueError("max_rows doit être >= 1")
 
         input_path = Path(input_csv)
-        if not input_path.exists():
-            raise FileNotFoundError(f"Fichier {input_csv} non trouvé")
-
-        if not input_path.suffix == ".csv":
-            raise ValueError(f"Fichier doit être un CSV (trouvé: {input_path.suffix})")
+        if input_path.suffix not in TABLE_SUFFIXES:
+            raise ValueError(
+                f"Fichier doit être un CSV, Parquet ou Feather (trouvé: {input_path.suffix})"
+            )
 
         # Afficher les paramètres
         table = Table(title="📋 Paramètres d'enrichissement", show_header=True)
@@ -460,26 +529,28 @@ def enrich_phones(
         console.print(
             "[bold yellow]⏳ Traitement des candidats...[/bold yellow]"
         )
-        enrich_with_phones(
+        df = enrich_with_phones(
             input_csv_path=input_csv,
             output_csv_path=output_csv,
             max_rows=max_rows,
+            output_format=output_format,
         )
         console.print()
 
         # Afficher les stats
-        df = pd.read_csv(output_csv)
-        enriched_count = (df["phone_status"] == "found").sum()
-        simulated_count = (df["phone_status"] == "simulated").sum()
-        skipped_count = (df["phone_status"] == "skipped").sum()
-        error_count = (df["phone_status"] == "error").sum()
+        rows_skipped = df.attrs.get("rows_skipped", 0)
+        status_counts = df["phone_status"].value_counts()
+        enriched_count = status_counts.get("found", 0)
+        simulated_count = status_counts.get("simulated", 0)
+        skipped_count = status_counts.get("skipped", 0) + rows_skipped
+        error_count = status_counts.get("error", 0)
 
         # Tableau de résumé
         table = Table(title="📊 Résumé d'enrichissement téléphones", show_header=True)
         table.add_column("Métrique", style="cyan", width=25)
         table.add_column("Valeur", style="green", width=20)
 
-        table.add_row("Total lignes", str(len(df)))
+        table.add_row("Total lignes", str(len(df) + rows_skipped))
         table.add_row("Téléphones trouvés (réels)", str(enriched_count))
         table.add_row("Téléphones simulés (stub)", str(simulated_count))
         table.add_row("Non traités", str(skipped_count))
@@ -504,13 +575,13 @@ def enrich_phones(
             preview_table.add_column("Source", style="magenta")
             preview_table.add_column("Statut", style="cyan")
 
-            for _, row in df.head(5).iterrows():
+            for row in _preview_records(df):
                 phone = row.get("phone", "N/A")
-                source = row.get("phone_source", "unknown")
-                status = row.get("phone_status", "unknown")
+                source = row.get("phone_source") or "unknown"
+                status = row.get("phone_status") or "unknown"
                 preview_table.add_row(
-                    row["prenom"],
-                    row["nom"],
+                    row["prenom"] or "",
+                    row["nom"] or "",
                     str(phone) if phone else "N/A",
                     str(source),
                     status,
@@ -589,6 +660,11 @@ def enrich_mobile_prod(
         help="Numverify API key pour validation (optionnel)",
         metavar="KEY",
     ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Ignorer le cache disque des recherches et validations",
+    ),
     verbose: bool = typer.Option(
         False,
         "--verbose",
@@ -613,6 +689,13 @@ def enrich_mobile_prod(
             --output-csv admissibles_mobiles.csv \\
             --max-batch 50
     """
+    from rich.table import Table
+
+    from agent_secret_adl.enrichment.prod_mobile import MobileEnricher
+    from agent_secret_adl.tabular import TABLE_SUFFIXES, read_table
+
+    console = _get_console()
+
     # Configuration logging
     if verbose:
         logging.basicConfig(
@@ -638,11 +721,10 @@ def enrich_mobile_prod(
             raise ValueError("max_batch doit être >= 1")
 
         input_path = Path(input_csv)
-        if not input_path.exists():
-            raise FileNotFoundError(f"Fichier {input_csv} non trouvé")
-
-        if not input_path.suffix == ".csv":
-            raise ValueError(f"Fichier doit être CSV (trouvé: {input_path.suffix})")
+        if input_path.suffix not in TABLE_SUFFIXES:
+            raise ValueError(
+                f"Fichier doit être CSV, Parquet ou Feather (trouvé: {input_path.suffix})"
+            )
 
         # Afficher paramètres
         table = Table(title="📋 Paramètres enrichissement mobile", show_header=True)
@@ -653,12 +735,13 @@ def enrich_mobile_prod(
         table.add_row("Max batch", str(max_batch))
         table.add_row("Google CSE", "✅" if google_cse_key else "❌ (optionnel)")
         table.add_row("Numverify", "✅" if numverify_key else "❌ (optionnel)")
+        table.add_row("Cache disque", "❌ (--no-cache)" if no_cache else "✅")
         console.print(table)
         console.print()
 
         # Charger CSV
         console.print("[bold yellow]⏳ Chargement CSV...[/bold yellow]")
-        df = pd.read_csv(input_csv)
+        df = read_table(input_csv)
         console.print(f"[green]✅ {len(df)} candidats chargés[/green]")
         console.print()
 
@@ -668,6 +751,7 @@ def enrich_mobile_prod(
             google_cse_key=google_cse_key,
             google_cse_id=google_cse_id,
             numverify_key=numverify_key,
+            cache_enabled=not no_cache,
         )
         console.print("[green]✅ Enrichisseur prêt[/green]")
         console.print()
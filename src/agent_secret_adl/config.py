@@ -1,5 +1,7 @@
 """Configuration globale du projet AGENT_SECRET_ADL."""
 
+import os
+from functools import lru_cache
 from pathlib import Path
 
 # Chemins principaux
@@ -8,15 +10,27 @@ DATA_DIR = PROJECT_ROOT / "data"
 OUTPUT_DIR = PROJECT_ROOT / "output"
 LOGS_DIR = PROJECT_ROOT / "logs"
 
-# Créer les répertoires s'ils n'existent pas
-DATA_DIR.mkdir(exist_ok=True)
-OUTPUT_DIR.mkdir(exist_ok=True)
-LOGS_DIR.mkdir(exist_ok=True)
+
+@lru_cache(maxsize=None)
+def ensure_dirs() -> None:
+    """
+    Crée les répertoires du projet s'ils n'existent pas (une fois par processus).
+
+    Appelée par les points d'entrée du pipeline plutôt qu'à l'import,
+    pour que --help / info ne touchent pas au système de fichiers.
+    """
+    for path in (DATA_DIR, OUTPUT_DIR, LOGS_DIR):
+        path.mkdir(parents=True, exist_ok=True)
+
 
 # Configuration d'extraction
 EXTRACTION_CONFIG = {
     "supported_formats": ["pdf"],
     "encoding": "utf-8",
+    # Moteur d'extraction de texte : "pymupdf" (rapide) ou "pdfplumber"
+    "backend": "pymupdf",
+    # Nombre de processus pour l'extraction des pages PDF
+    "num_workers": min(os.cpu_count() or 1, 4),
 }
 
 # Configuration de normalisation
@@ -30,6 +44,18 @@ ENRICHMENT_CONFIG = {
     "enabled": False,
     "timeout": 5,
     "retry_count": 2,
+    # Lookups réseau concurrents (sources réelles uniquement)
+    "max_workers": 10,
+    # Durée de vie des réponses en cache disque (secondes, 30 jours)
+    "cache_ttl": 86400 * 30,
+    # Durée de vie des résultats de recherche web en cache (7 jours)
+    "search_cache_ttl": 86400 * 7,
+    # Cadence max par source web (requêtes, période en secondes), partagée
+    # entre les threads d'un enrichisseur
+    "rate_limits": {
+        "google_cse": (1, 1),
+        "leboncoin": (1, 2),
+    },
 }
 
 # Configuration de reporting
@@ -1,9 +1,24 @@
 """Module d'enrichissement optionnel et low-scope des données candidates."""
 
+import importlib
 from typing import List, Dict, Any, Optional
 
-from .hunter import enrich_with_hunter
-from .phones import enrich_with_phones
+# Attributs chargés à la demande : nom -> sous-module (évite d'importer
+# pandas & co tant que l'enrichissement n'est pas utilisé)
+_LAZY = {
+    "enrich_with_hunter": ".hunter",
+    "enrich_with_phones": ".phones",
+}
+
+
+def __getattr__(name: str):
+    """Résout les fonctions d'enrichissement au premier accès (PEP 562)."""
+    if name in _LAZY:
+        module = importlib.import_module(_LAZY[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def enrich_candidates(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -54,4 +69,5 @@ __all__ = [
     "lookup_email",
     "is_enrichment_enabled",
     "enrich_with_hunter",
+    "enrich_with_phones",
 ]
@@ -0,0 +1,109 @@
+"""Cache disque des réponses des sources d'enrichissement."""
+
+import logging
+import unicodedata
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+from agent_secret_adl.config import LOGS_DIR
+
+logger = logging.getLogger(__name__)
+
+# Répertoire du cache persistant (partagé entre les exécutions)
+CACHE_DIR = LOGS_DIR / "enrich_cache"
+
+
+def cache_key(*parts: Optional[str]) -> str:
+    """
+    Construit une clé de cache normalisée à partir des champs d'une requête.
+
+    Accents supprimés (NFKD -> ASCII), casse et espaces superflus ignorés :
+    "Hélène  DUPONT" et "helene dupont" partagent la même entrée.
+
+    Args:
+        *parts: Champs de la requête (ex. prénom, nom, département).
+
+    Returns:
+        Clé de cache.
+    """
+    normalized = []
+    for part in parts:
+        text = unicodedata.normalize("NFKD", str(part or ""))
+        text = text.encode("ascii", "ignore").decode("ascii")
+        normalized.append(" ".join(text.lower().split()))
+    return "|".join(normalized)
+
+
+@contextmanager
+def open_cache() -> Iterator[Optional["diskcache.Cache"]]:
+    """
+    Ouvre le cache disque des sources d'enrichissement.
+
+    Le cache est optionnel : sans diskcache installé, None est produit et
+    les appelants interrogent directement les sources.
+
+    Yields:
+        diskcache.Cache (thread-safe), ou None.
+    """
+    if diskcache is None:
+        logger.debug("diskcache non installé, cache d'enrichissement désactivé")
+        yield None
+        return
+
+    with diskcache.Cache(str(CACHE_DIR)) as cache:
+        logger.debug(f"Cache d'enrichissement : {CACHE_DIR}")
+        yield cache
+
+
+def cache_get(cache: Optional["diskcache.Cache"], key: str) -> Any:
+    """
+    Lit une entrée du cache sans jamais lever d'exception.
+
+    Une entrée illisible (fichier corrompu, base verrouillée) est traitée
+    comme absente : l'appelant interroge alors directement la source.
+
+    Args:
+        cache: Cache ouvert (cf. open_cache), ou None.
+        key: Clé de l'entrée (cf. cache_key).
+
+    Returns:
+        Valeur en cache, ou None si absente ou illisible.
+    """
+    if cache is None:
+        return None
+    try:
+        return cache.get(key)
+    except Exception as e:
+        logger.warning(f"Lecture du cache impossible ({key}) : {e}")
+        return None
+
+
+def cache_set(
+    cache: Optional["diskcache.Cache"], key: str, value: Any, expire: float
+) -> None:
+    """
+    Enregistre une entrée du cache sans jamais lever d'exception.
+
+    Un échec d'écriture ne fait perdre que la mise en cache, pas la réponse
+    obtenue de la source.
+
+    Args:
+        cache: Cache ouvert (cf. open_cache), ou None.
+        key: Clé de l'entrée (cf. cache_key).
+        value: Valeur à enregistrer.
+        expire: Durée de validité (secondes).
+    """
+    if cache is None:
+        return
+    try:
+        cache.set(key, value, expire=expire)
+    except Exception as e:
+        logger.warning(f"Écriture du cache impossible ({key}) : {e}")
+
+
+__all__ = ["CACHE_DIR", "cache_get", "cache_key", "cache_set", "open_cache"]
@@ -0,0 +1,101 @@
+"""Session HTTP partagée et limitation de cadence des sources d'enrichissement."""
+
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from agent_secret_adl import __version__
+from agent_secret_adl.config import ENRICHMENT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Codes HTTP rejoués automatiquement (quota / erreurs serveur transitoires)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# User-Agent par défaut des requêtes (surchargeable par requête)
+USER_AGENT = f"agent-secret-adl/{__version__}"
+
+
+def build_session(pool_size: int = 20) -> requests.Session:
+    """
+    Construit une session requests avec pool de connexions et retries.
+
+    Une seule session par exécution : DNS, TCP et TLS sont réutilisés
+    (keep-alive) entre les requêtes, y compris depuis plusieurs threads.
+
+    Args:
+        pool_size: Nombre de connexions conservées par hôte.
+
+    Returns:
+        Session configurée (à fermer par l'appelant, ex. via `with`).
+    """
+    retry = Retry(
+        total=ENRICHMENT_CONFIG["retry_count"],
+        backoff_factor=0.3,
+        status_forcelist=RETRY_STATUS_CODES,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    logger.debug(f"Session HTTP créée (pool: {pool_size})")
+
+    return session
+
+
+class RateLimiter:
+    """
+    Seau à jetons thread-safe : au plus `rate` requêtes par `period` secondes.
+
+    Remplace les time.sleep() fixes après chaque appel : on n'attend que
+    si la cadence est dépassée, et la limite vaut pour tous les threads
+    qui partagent le limiteur (un sleep par thread ne limitait rien).
+
+    Exemple :
+        >>> limiter = RateLimiter(1, 2)  # 1 requête / 2 s
+        >>> limiter.acquire()
+        >>> session.get(url)
+    """
+
+    def __init__(self, rate: int, period: float = 1.0, burst: int = 1):
+        """
+        Args:
+            rate: Nombre de requêtes autorisées par période.
+            period: Durée de la période (secondes).
+            burst: Requêtes acceptées d'affilée après une pause.
+        """
+        self._interval = period / rate
+        self._capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Bloque jusqu'à ce qu'une requête soit autorisée."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity, self._tokens + (now - self._updated) / self._interval
+            )
+            self._updated = now
+            # Jeton réservé tout de suite (solde éventuellement négatif) :
+            # l'attente se fait hors verrou, dans l'ordre d'arrivée
+            self._tokens -= 1
+            wait = -self._tokens * self._interval if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+
+
+__all__ = ["build_session", "RateLimiter", "RETRY_STATUS_CODES", "USER_AGENT"]
@@ -1,21 +1,53 @@
 """Module d'enrichissement avec intégration Hunter.io (stub pour l'instant)."""
 
 import logging
+import string
+import unicodedata
 from pathlib import Path
 from typing import Optional
 import re
 
 import pandas as pd
 
+from agent_secret_adl.config import ensure_dirs
+from agent_secret_adl.tabular import (
+    iter_table_chunks,
+    open_table_writer,
+    read_table,
+    resolve_format,
+)
+
 logger = logging.getLogger(__name__)
 
+# Caractères retirés des prénoms/noms pour construire l'email
+_ALNUM_RE = re.compile(r"[^a-z0-9]")
+
+# Même règle pour une valeur isolée, sans regex : une seule passe
+# bytes.translate qui met l'ASCII en minuscules et supprime le reste
+_EMAIL_LOWER_TABLE = bytes.maketrans(
+    string.ascii_uppercase.encode("ascii"), string.ascii_lowercase.encode("ascii")
+)
+_EMAIL_DROP_BYTES = bytes(
+    c for c in range(128) if chr(c) not in string.ascii_letters + string.digits
+)
+
+# Valeurs possibles des colonnes de suivi (catégories fixes : même
+# dictionnaire dans chaque bloc écrit, encodé tel quel en Parquet/Feather)
+_ENRICHMENT_SOURCE_DTYPE = pd.CategoricalDtype(
+    ["stub", "hunter", "not_processed"]
+)
+_ENRICHMENT_STATUS_DTYPE = pd.CategoricalDtype(
+    ["simulated", "found", "error", "skipped"]
+)
+
 
 def enrich_with_hunter(
     input_csv_path: str,
     output_csv_path: str,
     api_key: str,
     max_rows: int = 20,
-) -> None:
+    output_format: Optional[str] = None,
+) -> pd.DataFrame:
     """
     Enrichit un CSV d'admissibles avec des emails via Hunter.io (stub).
 
@@ -27,9 +59,14 @@ def enrich_with_hunter(
         output_csv_path: Chemin de destination pour le CSV enrichi.
         api_key: Clé API Hunter.io (utilisée après implémentation réelle).
         max_rows: Nombre maximum de lignes à traiter (limiter l'usage API).
+        output_format: Format de sortie ("csv", "parquet" ou "feather"),
+            déduit de l'extension si None. L'entrée est lue selon son extension.
 
     Returns:
-        None. Écrit directement le fichier CSV enrichi.
+        DataFrame des lignes enrichies (les max_rows premières). Les lignes
+        suivantes sont recopiées par blocs dans le fichier de sortie (statut
+        "skipped") sans être chargées ; leur nombre est dans
+        df.attrs["rows_skipped"].
 
     Raises:
         FileNotFoundError: Si le fichier d'entrée n'existe pas.
@@ -47,8 +84,11 @@ def enrich_with_hunter(
         Actuellement un stub qui simule l'enrichissement.
         La vraie intégration Hunter.io sera branchée ultérieurement.
     """
+    ensure_dirs()
+
     input_csv_path = Path(input_csv_path)
     output_csv_path = Path(output_csv_path)
+    output_format = resolve_format(output_csv_path, output_format)
 
     # Validation du fichier d'entrée
     if not input_csv_path.exists():
@@ -59,48 +99,59 @@ def enrich_with_hunter(
     logger.info(f"Limite : {max_rows} lignes")
 
     try:
-        # Charger le CSV
-        df = pd.read_csv(input_csv_path)
+        # Charger uniquement les lignes à enrichir, en texte : la tête et le
+        # reste relu par blocs ont les mêmes types (identifiants tels quels)
+        df_to_enrich = read_table(input_csv_path, nrows=max_rows, as_text=True)
 
-        if df.empty:
+        if df_to_enrich.empty:
             logger.warning("Fichier CSV vide")
             raise ValueError("Le fichier CSV est vide")
 
-        logger.info(f"Total lignes chargées : {len(df)}")
-
-        # Limiter au nombre de lignes demandé
-        df_to_enrich = df.head(max_rows).copy()
-
         logger.info(f"Traitement de {len(df_to_enrich)} lignes")
 
         # Appliquer l'enrichissement (stub)
         df_enriched = _enrich_candidates_stub(df_to_enrich, api_key)
 
-        # Concaténer les lignes non traitées
-        if len(df) > max_rows:
-            df_remaining = df.iloc[max_rows:].copy()
-            df_remaining["email"] = None
-            df_remaining["enrichment_source"] = "not_processed"
-            df_remaining["enrichment_status"] = "skipped"
-            df_enriched = pd.concat(
-                [df_enriched, df_remaining], ignore_index=True
-            )
-
-            logger.info(
-                f"{len(df_remaining)} lignes non traitées (dépassement limite)"
-            )
-
         # Créer le répertoire de sortie
         output_csv_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Sauvegarder le CSV enrichi
-        df_enriched.to_csv(output_csv_path, index=False, encoding="utf-8")
+        # Sauvegarder : lignes enrichies, puis lignes non traitées par blocs
+        rows_skipped = 0
+        # Entrée plus courte que la limite : pas de reste, pas de seconde lecture
+        has_tail = len(df_to_enrich) >= max_rows
+        with open_table_writer(output_csv_path, output_format) as write:
+            write(df_enriched)
+            tail_chunks = ()
+            if has_tail:
+                tail_chunks = iter_table_chunks(
+                    input_csv_path, skip_rows=max_rows, as_text=True
+                )
+            for df_remaining in tail_chunks:
+                df_remaining["email"] = None
+                df_remaining["enrichment_source"] = pd.Series(
+                    "not_processed",
+                    index=df_remaining.index,
+                    dtype=_ENRICHMENT_SOURCE_DTYPE,
+                )
+                df_remaining["enrichment_status"] = pd.Series(
+                    "skipped",
+                    index=df_remaining.index,
+                    dtype=_ENRICHMENT_STATUS_DTYPE,
+                )
+                write(df_remaining)
+                rows_skipped += len(df_remaining)
+
+        if rows_skipped:
+            logger.info(f"{rows_skipped} lignes non traitées (dépassement limite)")
+
+        df_enriched.attrs["rows_skipped"] = rows_skipped
 
         logger.info(f"✅ Fichier enrichi généré : {output_csv_path}")
-        logger.info(f"   {len(df_enriched)} candidats exportés")
-        logger.info(
-            f"   Enrichis : {(df_enriched['enrichment_status'] == 'simulated').sum()}"
-        )
+        logger.info(f"   {len(df_enriched) + rows_skipped} candidats exportés")
+        status_counts = df_enriched["enrichment_status"].value_counts()
+        logger.info(f"   Enrichis : {status_counts.get('simulated', 0)}")
+
+        return df_enriched
 
     except FileNotFoundError:
         raise
@@ -121,35 +172,87 @@ def _enrich_candidates_stub(
     Structure prête pour remplacer par un vrai appel Hunter.io.
 
     Args:
-        df: DataFrame contenant les candidats (doit avoir 'prenom' et 'nom').
+        df: DataFrame contenant les candidats (doit avoir 'prenom' et 'nom'),
+            complété en place.
         api_key: Clé API (non utilisée pour l'instant, sera utilisée après).
 
     Returns:
         DataFrame enrichi avec colonnes email, enrichment_source, enrichment_status.
     """
-    df_enriched = df.copy()
+    # Pas de copie : le DataFrame vient d'être chargé pour cet enrichissement
+    df_enriched = df
 
-    # Initialiser les colonnes d'enrichissement
+    # Initialiser les colonnes d'enrichissement (source/statut catégoriels)
     df_enriched["email"] = None
-    df_enriched["enrichment_source"] = "stub"
-    df_enriched["enrichment_status"] = "simulated"
-
-    # Générer les emails (stub pattern)
-    for idx, row in df_enriched.iterrows():
-        try:
-            email = _generate_email_pattern(row["prenom"], row["nom"])
-            df_enriched.at[idx, "email"] = email
-        except (KeyError, TypeError) as e:
-            logger.warning(f"Impossible de générer email pour ligne {idx} : {e}")
-            df_enriched.at[idx, "enrichment_status"] = "error"
-
-    logger.debug(
-        f"Stub enrichissement : {(df_enriched['email'].notna()).sum()} emails générés"
+    df_enriched["enrichment_source"] = pd.Series(
+        "stub", index=df_enriched.index, dtype=_ENRICHMENT_SOURCE_DTYPE
+    )
+    df_enriched["enrichment_status"] = pd.Series(
+        "simulated", index=df_enriched.index, dtype=_ENRICHMENT_STATUS_DTYPE
+    )
+
+    # Générer les emails (stub pattern), en colonnes plutôt que ligne à ligne
+    try:
+        prenom = df_enriched["prenom"]
+        nom = df_enriched["nom"]
+    except KeyError as e:
+        logger.warning(f"Impossible de générer les emails : colonne {e} absente")
+        df_enriched.loc[:, "enrichment_status"] = "error"
+        return df_enriched
+
+    # Prénom et nom requis (cf. _generate_email_pattern)
+    missing = (
+        prenom.isna() | prenom.astype(str).eq("") | nom.isna() | nom.astype(str).eq("")
+    )
+
+    # Emails calculés sur les seules lignes valides, statut d'erreur en une fois
+    valid = ~missing
+    emails = (
+        _clean_email_part(prenom[valid])
+        + "."
+        + _clean_email_part(nom[valid])
+        + "+test@example.com"
     )
+    df_enriched.loc[valid, "email"] = emails.astype(object)
+    df_enriched.loc[missing, "enrichment_status"] = "error"
+
+    missing_count = int(missing.sum())
+    if missing_count:
+        logger.warning(
+            f"Impossible de générer email pour {missing_count} ligne(s) "
+            f"(prénom ou nom manquant)"
+        )
+
+    logger.debug(f"Stub enrichissement : {len(emails)} emails générés")
 
     return df_enriched
 
 
+def _clean_email_part(values: pd.Series) -> pd.Series:
+    """
+    Normalise une colonne prénom/nom pour l'email (version vectorisée).
+
+    Même règle que _generate_email_pattern : accents décomposés (NFKD,
+    "François" -> "francois"), minuscules, seuls a-z et 0-9 sont conservés.
+    Chaque valeur distincte n'est nettoyée qu'une fois (prénoms et noms
+    se répètent), puis le résultat est redistribué sur les lignes.
+
+    Args:
+        values: Colonne prénom ou nom.
+
+    Returns:
+        Colonne nettoyée (chaînes), même index que values.
+    """
+    codes, uniques = pd.factorize(values.astype(str))
+    cleaned = (
+        pd.Series(uniques, dtype=object)
+        .str.normalize("NFKD")
+        .str.lower()
+        .str.replace(_ALNUM_RE, "", regex=True)
+    )
+    return pd.Series(cleaned.to_numpy()[codes], index=values.index, dtype=object)
+
+
 def _generate_email_pattern(prenom: str, nom: str) -> str:
     """
     Génère un email au format prenom.nom@example.com.
@@ -167,8 +270,8 @@ def _generate_email_pattern(prenom: str, nom: str) -> str:
         raise ValueError("Prénom et nom requis")
 
     # Normaliser les caractères
-    prenom_clean = re.sub(r"[^a-z0-9]", "", prenom.lower())
-    nom_clean = re.sub(r"[^a-z0-9]", "", nom.lower())
+    prenom_clean = _clean_email_value(prenom)
+    nom_clean = _clean_email_value(nom)
 
     # Format : prenom.nom@example.com
     email = f"{prenom_clean}.{nom_clean}+test@example.com"
@@ -176,6 +279,28 @@ def _generate_email_pattern(prenom: str, nom: str) -> str:
     return email
 
 
+def _clean_email_value(value: str) -> str:
+    """
+    Normalise un prénom/nom pour l'email (valeur isolée).
+
+    Décomposition NFKD (les accents deviennent des marques combinantes,
+    écartées à l'encodage ASCII), puis une seule passe bytes.translate
+    pour la casse et les caractères hors a-z/0-9.
+
+    Args:
+        value: Prénom ou nom.
+
+    Returns:
+        Valeur nettoyée (a-z, 0-9).
+    """
+    return (
+        unicodedata.normalize("NFKD", value)
+        .encode("ascii", "ignore")
+        .translate(_EMAIL_LOWER_TABLE, _EMAIL_DROP_BYTES)
+        .decode("ascii")
+    )
+
+
 def is_enrichment_enabled() -> bool:
     """Vérifie si l'enrichissement est disponible."""
     return True
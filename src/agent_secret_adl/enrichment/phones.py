@@ -1,20 +1,61 @@
 """Module d'enrichissement téléphones - Multi-sources gratuites et fiables."""
 
 import logging
+import math
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+from itertools import repeat
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from agent_secret_adl.config import ENRICHMENT_CONFIG, ensure_dirs
+from agent_secret_adl.tabular import (
+    iter_table_chunks,
+    open_table_writer,
+    read_table,
+    resolve_format,
+)
+
 logger = logging.getLogger(__name__)
 
+# Sources réellement branchées (False tant que ce sont des stubs) : une
+# source désactivée n'est pas interrogée dans la cascade
+_SIRENE_ENABLED = False
+_PAGES_JAUNES_ENABLED = False
+_ANNUAIRES_ENABLED = False
+
+# Caractères retirés d'un numéro brut (on garde chiffres et "+")
+_PHONE_CLEAN_RE = re.compile(r"[^\d+]")
+
+# Même nettoyage sans regex pour l'ASCII : table de suppression précalculée
+_PHONE_DROP_TABLE = str.maketrans(
+    "", "", "".join(chr(c) for c in range(128) if chr(c) not in "0123456789+")
+)
+
+# Format FR : XX XX XX XX XX (10 chiffres + espaces)
+_PHONE_VALID_RE = re.compile(r"0[1-9]( [0-9]{2}){4}")
+_PHONE_VALID_LENGTH = 14
+
+# Valeurs possibles des colonnes de suivi (catégories fixes : même
+# dictionnaire dans chaque bloc écrit, encodé tel quel en Parquet/Feather)
+_PHONE_SOURCE_DTYPE = pd.CategoricalDtype(
+    ["SIRENE", "pagesjaunes.fr", "annuaire_public", "stub", "unknown", "not_processed"]
+)
+_PHONE_STATUS_DTYPE = pd.CategoricalDtype(
+    ["found", "simulated", "not_found", "error", "skipped"]
+)
+
 
 def enrich_with_phones(
     input_csv_path: str,
     output_csv_path: str,
     max_rows: int = 50,
-) -> None:
+    output_format: Optional[str] = None,
+) -> pd.DataFrame:
     """
     Enrichit un CSV avec des numéros de téléphone via sources publiques gratuites.
 
@@ -28,9 +69,14 @@ def enrich_with_phones(
         input_csv_path: Chemin du CSV (sortie enrich-hunter recommandée)
         output_csv_path: Chemin CSV enrichi avec phones
         max_rows: Nombre max de lignes à traiter
+        output_format: Format de sortie ("csv", "parquet" ou "feather"),
+            déduit de l'extension si None. L'entrée est lue selon son extension.
 
     Returns:
-        None. Écrit CSV enrichi avec colonnes phone + sources métadonnées
+        DataFrame des lignes enrichies (les max_rows premières) avec colonnes
+        phone + sources métadonnées. Les lignes suivantes sont recopiées par
+        blocs dans le fichier de sortie (statut "skipped") sans être
+        chargées ; leur nombre est dans df.attrs["rows_skipped"]
 
     Raises:
         FileNotFoundError: Si le fichier d'entrée n'existe pas
@@ -43,8 +89,11 @@ def enrich_with_phones(
         ...     max_rows=50,
         ... )
     """
+    ensure_dirs()
+
     input_csv_path = Path(input_csv_path)
     output_csv_path = Path(output_csv_path)
+    output_format = resolve_format(output_csv_path, output_format)
 
     # Validation
     if not input_csv_path.exists():
@@ -56,49 +105,65 @@ def enrich_with_phones(
     logger.info(f"Limite : {max_rows} lignes")
 
     try:
-        # Charger le CSV
-        df = pd.read_csv(input_csv_path)
+        # Charger uniquement les lignes à enrichir, en texte : la tête et le
+        # reste relu par blocs ont les mêmes types (identifiants tels quels)
+        df_to_enrich = read_table(input_csv_path, nrows=max_rows, as_text=True)
 
-        if df.empty:
+        if df_to_enrich.empty:
             logger.warning("Fichier CSV vide")
             raise ValueError("Le fichier CSV est vide")
 
-        logger.info(f"Total lignes chargées : {len(df)}")
-
-        # Limiter au nombre demandé
-        df_to_enrich = df.head(max_rows).copy()
-
         logger.info(f"Traitement de {len(df_to_enrich)} lignes")
 
         # Appliquer l'enrichissement téléphones
         df_enriched = _enrich_phones_multi_source(df_to_enrich)
 
-        # Concaténer les lignes non traitées
-        if len(df) > max_rows:
-            df_remaining = df.iloc[max_rows:].copy()
-            df_remaining["phone"] = None
-            df_remaining["phone_source"] = "not_processed"
-            df_remaining["phone_status"] = "skipped"
-            df_enriched = pd.concat(
-                [df_enriched, df_remaining], ignore_index=True
-            )
-            logger.info(
-                f"{len(df_remaining)} lignes non traitées (dépassement limite)"
-            )
-
         # Créer le répertoire si nécessaire
         output_csv_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Sauvegarder
-        df_enriched.to_csv(output_csv_path, index=False, encoding="utf-8")
+        # Sauvegarder : lignes enrichies, puis lignes non traitées par blocs
+        rows_skipped = 0
+        # Entrée plus courte que la limite : pas de reste, pas de seconde lecture
+        has_tail = len(df_to_enrich) >= max_rows
+        with open_table_writer(output_csv_path, output_format) as write:
+            write(df_enriched)
+            tail_chunks = ()
+            if has_tail:
+                tail_chunks = iter_table_chunks(
+                    input_csv_path, skip_rows=max_rows, as_text=True
+                )
+            for df_remaining in tail_chunks:
+                df_remaining["phone"] = None
+                df_remaining["phone_source"] = pd.Series(
+                    "not_processed",
+                    index=df_remaining.index,
+                    dtype=_PHONE_SOURCE_DTYPE,
+                )
+                df_remaining["phone_status"] = pd.Series(
+                    "skipped",
+                    index=df_remaining.index,
+                    dtype=_PHONE_STATUS_DTYPE,
+                )
+                write(df_remaining)
+                rows_skipped += len(df_remaining)
+
+        if rows_skipped:
+            logger.info(f"{rows_skipped} lignes non traitées (dépassement limite)")
+
+        df_enriched.attrs["rows_skipped"] = rows_skipped
 
         logger.info(f"✅ Fichier enrichi généré : {output_csv_path}")
-        logger.info(f"   {len(df_enriched)} candidats exportés")
+        logger.info(f"   {len(df_enriched) + rows_skipped} candidats exportés")
 
         # Stats par source
-        stats = df_enriched["phone_status"].value_counts().to_dict()
+        status_counts = df_enriched["phone_status"].value_counts()
+        stats = status_counts[status_counts > 0].to_dict()
+        if rows_skipped:
+            stats["skipped"] = rows_skipped
         logger.info(f"   Statut d'enrichissement : {stats}")
 
+        return df_enriched
+
     except FileNotFoundError:
         raise
     except ValueError:
@@ -119,55 +184,193 @@ def _enrich_phones_multi_source(df: pd.DataFrame) -> pd.DataFrame:
     4. Stub si absent
 
     Args:
-        df: DataFrame avec candidats
+        df: DataFrame avec candidats, complété en place
 
     Returns:
         DataFrame enrichi avec colonnes phone, phone_source, phone_status
     """
-    df_enriched = df.copy()
+    # Pas de copie : le DataFrame vient d'être chargé pour cet enrichissement
+    df_enriched = df
+
+    if ENRICHMENT_CONFIG["enabled"] and _active_sources():
+        results = _lookup_phones_live(df_enriched)
+
+        # Une seule affectation par colonne (défauts : non trouvé)
+        phones = [None] * len(results)
+        sources = ["unknown"] * len(results)
+        statuses = ["not_found"] * len(results)
+        for i, phone_result in enumerate(results):
+            if phone_result:
+                phones[i] = phone_result.get("phone")
+                sources[i] = phone_result.get("source")
+                statuses[i] = phone_result.get("status")
+
+        df_enriched["phone"] = phones
+        df_enriched["phone_source"] = pd.Categorical(
+            sources, dtype=_PHONE_SOURCE_DTYPE
+        )
+        df_enriched["phone_status"] = pd.Categorical(
+            statuses, dtype=_PHONE_STATUS_DTYPE
+        )
+    else:
+        # Aucune source active : la cascade aboutirait au stub pour chaque
+        # ligne, la colonne est générée en une fois
+        df_enriched["phone"] = _vectorized_stub_phones(df_enriched.index)
+        df_enriched["phone_source"] = pd.Series(
+            "stub", index=df_enriched.index, dtype=_PHONE_SOURCE_DTYPE
+        )
+        df_enriched["phone_status"] = pd.Series(
+            "simulated", index=df_enriched.index, dtype=_PHONE_STATUS_DTYPE
+        )
+
+    status_counts = df_enriched["phone_status"].value_counts()
+    logger.debug(
+        f"Téléphones trouvés : {status_counts.get('found', 0)} réels, "
+        f"{status_counts.get('simulated', 0)} simulés"
+    )
+
+    return df_enriched
+
+
+def _lookup_phones_live(df: pd.DataFrame) -> List[Optional[Dict[str, Any]]]:
+    """
+    Interroge les sources réelles pour chaque candidat.
+
+    Lookups concurrents sur une session poolée, réponses mises en cache
+    disque entre les exécutions. Les candidats en double (même nom et même
+    département) ne déclenchent qu'une seule cascade ; ceux sans prénom ni
+    nom n'en déclenchent aucune (statut "error").
+
+    Args:
+        df: DataFrame avec candidats (prenom, nom, departement)
+
+    Returns:
+        Résultats {phone, source, status} dans l'ordre des lignes
+    """
+    from .cache import cache_key, open_cache
+    from .http import build_session
+
+    # Nom complet calculé une fois pour toutes les lignes
+    names = df.reindex(columns=["prenom", "nom"]).fillna("").astype(str)
+    noms_complets = (names["prenom"] + " " + names["nom"]).str.strip().tolist()
+    indices = df.index.tolist()
+
+    departements = df.get("departement", repeat(None))
+    keys = [
+        cache_key(nom_complet, departement)
+        for nom_complet, departement in zip(noms_complets, departements)
+    ]
+
+    # Première occurrence de chaque clé nommée : c'est elle qui est interrogée
+    first_rows = {}
+    for row, key in enumerate(keys):
+        if noms_complets[row]:
+            first_rows.setdefault(key, row)
+    unique_keys = list(first_rows)
+    unique_rows = list(first_rows.values())
+
+    max_workers = ENRICHMENT_CONFIG["max_workers"]
+    with open_cache() as cache, build_session(
+        pool_size=max_workers
+    ) as session, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        found = dict(
+            zip(
+                unique_keys,
+                executor.map(
+                    _lookup_phone,
+                    [noms_complets[row] for row in unique_rows],
+                    [indices[row] for row in unique_rows],
+                    repeat(session),
+                    repeat(cache),
+                    unique_keys,
+                ),
+            )
+        )
+
+    if len(unique_keys) < len(keys):
+        logger.debug(f"{len(keys) - len(unique_keys)} candidats en double réutilisés")
+
+    # Sans réponse réelle : stub propre à chaque ligne
+    return [
+        (found[key] or _generate_phone_stub(nom_complet, idx))
+        if nom_complet
+        else {"phone": None, "source": "unknown", "status": "error"}
+        for key, nom_complet, idx in zip(keys, noms_complets, indices)
+    ]
+
+
+def _vectorized_stub_phones(index: pd.Index) -> np.ndarray:
+    """
+    Génère en une fois les téléphones stub d'un lot de lignes.
 
-    # Initialiser les colonnes
-    df_enriched["phone"] = None
-    df_enriched["phone_source"] = "unknown"
-    df_enriched["phone_status"] = "not_found"
+    Mêmes numéros que _generate_phone_stub, lus en une fois dans le cycle
+    précalculé _STUB_CYCLE.
+
+    Args:
+        index: Index des lignes
+
+    Returns:
+        Tableau des numéros (chaînes)
+    """
+    idx = np.asarray(index, dtype=np.int64)
+    return _STUB_CYCLE.take(idx % _STUB_PERIOD)
 
-    for idx, row in df_enriched.iterrows():
-        try:
-            prenom = row.get("prenom", "")
-            nom = row.get("nom", "")
-            nom_complet = f"{prenom} {nom}".strip()
 
-            # Cascade de sources
-            phone_result = _try_sirene(nom_complet, idx)
+def _active_sources() -> List[Tuple[str, Callable[..., Optional[Dict[str, str]]]]]:
+    """Sources de la cascade actuellement branchées, dans l'ordre."""
+    return [(name, source) for name, source, enabled in _PHONE_SOURCES if enabled()]
 
-            if not phone_result:
-                phone_result = _try_pages_jaunes(nom_complet, idx)
 
-            if not phone_result:
-                phone_result = _try_annuaires_publics(nom_complet, idx)
+def _lookup_phone(
+    nom_complet: str,
+    idx: int,
+    session=None,
+    cache=None,
+    key: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Cherche le téléphone d'un candidat en cascade sur les sources.
+
+    Args:
+        nom_complet: Nom complet du candidat
+        idx: Index de la ligne
+        session: Session HTTP partagée (sources réelles), ou None
+        cache: Cache disque des réponses (cf. cache.open_cache), ou None
+        key: Clé de cache normalisée du candidat
 
-            if not phone_result:
-                phone_result = _generate_phone_stub(nom_complet, idx)
+    Returns:
+        Dict avec {phone, source, status}, ou None si aucune source n'a
+        répondu
+    """
+    from .cache import cache_get, cache_set
 
+    try:
+        # Entrée illisible = absente : interrogation directe des sources
+        cached = cache_get(cache, key) if key is not None else None
+        if cached is not None:
+            logger.debug(f"[{idx}] Téléphone en cache : {nom_complet}")
+            return cached
+
+        # Cascade sur les sources actives (arrêt à la première réponse)
+        phone_result = None
+        for _, try_source in _active_sources():
+            phone_result = try_source(nom_complet, idx, session)
             if phone_result:
-                df_enriched.at[idx, "phone"] = phone_result.get("phone")
-                df_enriched.at[idx, "phone_source"] = phone_result.get("source")
-                df_enriched.at[idx, "phone_status"] = phone_result.get("status")
+                break
 
-        except Exception as e:
-            logger.warning(f"Erreur enrichissement ligne {idx} : {e}")
-            df_enriched.at[idx, "phone_status"] = "error"
+        if phone_result and key is not None:
+            cache_set(cache, key, phone_result, expire=ENRICHMENT_CONFIG["cache_ttl"])
 
-    enriched_count = (df_enriched["phone_status"] == "found").sum()
-    stub_count = (df_enriched["phone_status"] == "simulated").sum()
-    logger.debug(
-        f"Téléphones trouvés : {enriched_count} réels, {stub_count} simulés"
-    )
+        return phone_result
 
-    return df_enriched
+    except Exception as e:
+        logger.warning(f"Erreur enrichissement ligne {idx} : {e}")
+        return {"phone": None, "source": "unknown", "status": "error"}
 
 
-def _try_sirene(nom_complet: str, idx: int) -> Optional[Dict[str, str]]:
+def _try_sirene(
+    nom_complet: str, idx: int, session=None
+) -> Optional[Dict[str, str]]:
     """
     Cherche un téléphone via SIRENE (données officielles France - gratuit).
 
@@ -179,6 +382,7 @@ def _try_sirene(nom_complet: str, idx: int) -> Optional[Dict[str, str]]:
     Args:
         nom_complet: Nom complet du candidat
         idx: Index de la ligne
+        session: Session HTTP partagée (cf. http.build_session)
 
     Returns:
         Dict avec {phone, source, status} ou None
@@ -191,10 +395,11 @@ def _try_sirene(nom_complet: str, idx: int) -> Optional[Dict[str, str]]:
         logger.debug(f"[{idx}] Tentative SIRENE : {nom_complet}")
 
         # En production:
-        # response = requests.get(
+        # response = session.get(
         #     "https://api.insee.fr/enterprise/sirene/v3/siret",
         #     params={"q": nom_complet},
-        #     headers={"Authorization": f"Bearer {os.environ.get('SIRENE_TOKEN')}"}
+        #     headers={"Authorization": f"Bearer {os.environ.get('SIRENE_TOKEN')}"},
+        #     timeout=ENRICHMENT_CONFIG["timeout"],
         # )
         # if response.status_code == 200:
         #     data = response.json()
@@ -215,7 +420,9 @@ def _try_sirene(nom_complet: str, idx: int) -> Optional[Dict[str, str]]:
         return None
 
 
-def _try_pages_jaunes(nom_complet: str, idx: int) -> Optional[Dict[str, str]]:
+def _try_pages_jaunes(
+    nom_complet: str, idx: int, session=None
+) -> Optional[Dict[str, str]]:
     """
     Cherche un téléphone via Pages Jaunes publiques (gratuit, scraping autorisé).
 
@@ -226,6 +433,7 @@ def _try_pages_jaunes(nom_complet: str, idx: int) -> Optional[Dict[str, str]]:
     Args:
         nom_complet: Nom complet
         idx: Index
+        session: Session HTTP partagée
 
     Returns:
         Dict ou None
@@ -244,7 +452,9 @@ def _try_pages_jaunes(nom_complet: str, idx: int) -> Optional[Dict[str, str]]:
 
         # En production (avec requests + BeautifulSoup):
         # url = f"https://www.pagesjaunes.fr/search?quoiqui={nom_complet}"
-        # response = requests.get(url, headers=USER_AGENT)
+        # response = session.get(
+        #     url, headers=USER_AGENT, timeout=ENRICHMENT_CONFIG["timeout"]
+        # )
         # soup = BeautifulSoup(response.text, "html.parser")
         # phone_elem = soup.find("span", class_="phone")
         # if phone_elem:
@@ -255,7 +465,9 @@ def _try_pages_jaunes(nom_complet: str, idx: int) -> Optional[Dict[str, str]]:
         return None
 
 
-def _try_annuaires_publics(nom_complet: str, idx: int) -> Optional[Dict[str, str]]:
+def _try_annuaires_publics(
+    nom_complet: str, idx: int, session=None
+) -> Optional[Dict[str, str]]:
     """
     Cherche via annuaires publics (gratuit, open data).
 
@@ -267,6 +479,7 @@ def _try_annuaires_publics(nom_complet: str, idx: int) -> Optional[Dict[str, str
     Args:
         nom_complet: Nom complet
         idx: Index
+        session: Session HTTP partagée
 
     Returns:
         Dict ou None
@@ -293,6 +506,32 @@ def _try_annuaires_publics(nom_complet: str, idx: int) -> Optional[Dict[str, str
         return None
 
 
+# Cascade : (nom, fonction, activée ?) — l'état est relu à chaque appel
+_PHONE_SOURCES = (
+    ("SIRENE", _try_sirene, lambda: _SIRENE_ENABLED),
+    ("pagesjaunes.fr", _try_pages_jaunes, lambda: _PAGES_JAUNES_ENABLED),
+    ("annuaire_public", _try_annuaires_publics, lambda: _ANNUAIRES_ENABLED),
+)
+
+# Indicatifs utilisés par le stub (01 à 05 : France métropolitaine)
+_STUB_ZONE_CODES = ("01", "02", "03", "04", "05")
+
+# Le numéro stub est périodique en idx (PPCM des modulos : 8400) : le cycle
+# est précalculé une fois, chaque ligne n'est plus qu'une lecture indexée
+# (math.lcm à plusieurs arguments n'existe qu'à partir de Python 3.9)
+_STUB_PERIOD = reduce(
+    lambda a, b: a * b // math.gcd(a, b), (len(_STUB_ZONE_CODES), 50, 60, 70, 80)
+)
+_STUB_CYCLE = np.array(
+    [
+        f"{_STUB_ZONE_CODES[i % len(_STUB_ZONE_CODES)]} "
+        f"{50+i%50:02d} {60+i%60:02d} {70+i%70:02d} {80+i%80:02d}"
+        for i in range(_STUB_PERIOD)
+    ],
+    dtype=object,
+)
+
+
 def _generate_phone_stub(nom_complet: str, idx: int) -> Optional[Dict[str, str]]:
     """
     Génère un pattern téléphone plausible (stub fallback).
@@ -309,14 +548,9 @@ def _generate_phone_stub(nom_complet: str, idx: int) -> Optional[Dict[str, str]]
         Dict stub
     """
     try:
-        # Pattern : format FR standard (01 à 05 selon région stub)
-        zone_codes = ["01", "02", "03", "04", "05"]
-        zone = zone_codes[idx % len(zone_codes)]
-
-        phone = f"{zone} {50+idx%50:02d} {60+idx%60:02d} {70+idx%70:02d} {80+idx%80:02d}"
-
+        # Pattern : format FR standard (01 à 05 selon région stub), cf. _STUB_CYCLE
         return {
-            "phone": phone,
+            "phone": _STUB_CYCLE[idx % _STUB_PERIOD],
             "source": "stub",
             "status": "simulated",
         }
@@ -349,7 +583,12 @@ def _normalize_phone_result(
         return None
 
     # Nettoyer
-    phone_clean = re.sub(r"[^\d+]", "", phone_raw.strip())
+    phone_clean = phone_raw.strip()
+    if phone_clean.isascii():
+        phone_clean = phone_clean.translate(_PHONE_DROP_TABLE)
+    else:
+        # Rare (espaces insécables, chiffres non ASCII) : regex Unicode
+        phone_clean = _PHONE_CLEAN_RE.sub("", phone_clean)
 
     # Normaliser format FR : 01 XX XX XX XX
     if phone_clean.startswith("033"):
@@ -378,18 +617,42 @@ def validate_phone(phone: str) -> bool:
     """
     Valide un format de téléphone.
 
+    Format attendu : "0X XX XX XX XX" (X de 1 à 9 pour la zone). Format de
+    longueur fixe : contrôle direct des positions, sans regex.
+
     Args:
         phone: Numéro à valider
 
     Returns:
         True si valide
     """
-    if not phone:
+    if not phone or len(phone) != _PHONE_VALID_LENGTH:
+        return False
+
+    # Séparateurs aux positions 2, 5, 8 et 11
+    if phone[2::3] != "    ":
         return False
 
-    # Format FR : XX XX XX XX XX (10 chiffres + espaces)
-    pattern = r"^0[1-9]\s\d{2}\s\d{2}\s\d{2}\s\d{2}$"
-    return bool(re.match(pattern, phone))
+    digits = phone[1] + phone[3:5] + phone[6:8] + phone[9:11] + phone[12:14]
+    return (
+        phone[0] == "0"
+        and phone[1] != "0"
+        and digits.isascii()
+        and digits.isdigit()
+    )
+
+
+def validate_phones_series(phones: pd.Series) -> pd.Series:
+    """
+    Valide une colonne de téléphones en une passe (même règle que validate_phone).
+
+    Args:
+        phones: Numéros à valider (valeurs manquantes acceptées)
+
+    Returns:
+        Série booléenne (False pour les valeurs manquantes)
+    """
+    return phones.astype("string").str.fullmatch(_PHONE_VALID_RE).fillna(False).astype(bool)
 
 
-__all__ = ["enrich_with_phones"]
+__all__ = ["enrich_with_phones", "validate_phone", "validate_phones_series"]
@@ -1,15 +1,72 @@
 """Module enrichissement mobile PRODUCTION - Recherche numéros 06/07 français."""
 
 import logging
+import os
 import re
-import time
+import unicodedata
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Optional, Dict, List, Any
 
 import pandas as pd
+import requests
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:  # scraping d'annonces désactivé
+    BeautifulSoup = None
+
+try:
+    import lxml  # noqa: F401  (parseur HTML en C, plus rapide)
+    _HTML_PARSER = "lxml"
+except ImportError:
+    _HTML_PARSER = "html.parser"
+
+from agent_secret_adl.config import ENRICHMENT_CONFIG
+from agent_secret_adl.tabular import write_csv
+
+from .cache import cache_get, cache_key, cache_set, open_cache
+from .http import RateLimiter, build_session
 
 logger = logging.getLogger(__name__)
 
+# Regex compilées une fois (chemin chaud : chaque snippet / numéro testé).
+# Mobile FR 06/07 isolé : lookarounds plutôt que (?:^|\D)...(?:\D|$), qui
+# consommaient le séparateur et masquaient un numéro juste après un autre
+_MOBILE_RE = re.compile(r"(?<!\d)(0[67](?:\s?\d{2}){4})(?!\d)")
+_MOBILE_STRICT_RE = re.compile(r"0[67]\d{8}")
+_WHITESPACE_RE = re.compile(r"\s")
+
+# Au-delà de cette taille, une page sans numéro dans le HTML brut est
+# reparsée (numéro possiblement découpé par des balises)
+_SOUP_FALLBACK_MIN_BYTES = 200 * 1024
+
+# Colonnes lues par la cascade de recherche
+_SEARCH_COLUMNS = ("prenom", "nom", "departement")
+
+
+@lru_cache(maxsize=4096)
+def _ascii_fold(name: str) -> str:
+    """
+    Forme de requête d'un nom : ASCII sans accents, en minuscules.
+
+    "Jéan" et "JEAN" donnent la même requête (mêmes résultats côté Google /
+    Leboncoin), donc la même entrée de cache et un seul appel par batch.
+    """
+    folded = unicodedata.normalize("NFKD", name).encode("ascii", "ignore")
+    return folded.decode().lower()
+
+
+def _row_text(row: Dict[str, Any], column: str) -> str:
+    """Valeur texte d'une colonne ("" si absente ou manquante)."""
+    value = row.get(column)
+    if value is None or pd.isna(value):
+        return ""
+    return str(value).strip()
+
 
 class MobileEnricher:
     """
@@ -24,14 +81,15 @@ class MobileEnricher:
     Taux de succès visé : 40% découverte + 90% validation
     """
 
-    # Regex français mobiles (06 ou 07)
-    MOBILE_REGEX = r"(?:^|\D)(0[67](?:\s?\d{2}){4})(?:\D|$)"
+    # Regex français mobiles (06 ou 07), compilée dans _MOBILE_RE
+    MOBILE_REGEX = _MOBILE_RE.pattern
 
     def __init__(
         self,
         google_cse_key: Optional[str] = None,
         google_cse_id: Optional[str] = None,
         numverify_key: Optional[str] = None,
+        cache_enabled: bool = True,
     ):
         """
         Initialise l'enrichisseur mobile.
@@ -40,10 +98,18 @@ class MobileEnricher:
             google_cse_key: Google Custom Search API key (gratuit 100/jour)
             google_cse_id: Google Custom Search Engine ID
             numverify_key: Numverify API key (gratuit 100 validations/jour)
+            cache_enabled: Réutiliser les réponses en cache disque (recherches
+                7 jours, validations Numverify 30 jours)
         """
         self.google_cse_key = google_cse_key or self._get_env_var("GOOGLE_CSE_KEY")
         self.google_cse_id = google_cse_id or self._get_env_var("GOOGLE_CSE_ID")
         self.numverify_key = numverify_key or self._get_env_var("NUMVERIFY_KEY")
+        self.cache_enabled = cache_enabled
+
+        # Cadence des sources web, commune à tous les threads du batch
+        rate_limits = ENRICHMENT_CONFIG["rate_limits"]
+        self._google_limiter = RateLimiter(*rate_limits["google_cse"])
+        self._leboncoin_limiter = RateLimiter(*rate_limits["leboncoin"])
 
         self.stats = {
             "total_processed": 0,
@@ -52,14 +118,35 @@ class MobileEnricher:
             "errors": 0,
         }
 
+        # Sources de la cascade utilisables, déterminées une fois pour toutes
+        self._available_sources = self._probe_sources()
+
         logger.info("MobileEnricher initialisé")
         logger.debug(f"Google CSE: {bool(self.google_cse_key)}")
         logger.debug(f"Numverify: {bool(self.numverify_key)}")
+        logger.debug(f"Sources actives: {self._available_sources or 'aucune'}")
+
+    def _probe_sources(self) -> List[str]:
+        """
+        Détermine les sources de recherche utilisables (clés, dépendances).
+
+        Une source inutilisable est écartée pour tout le batch au lieu
+        d'être retentée (et journalisée) à chaque candidat.
+
+        Returns:
+            Noms des sources actives, dans l'ordre de la cascade
+        """
+        sources = []
+        if self.google_cse_key and self.google_cse_id:
+            sources.append("google_dorks")
+        if BeautifulSoup is not None:
+            sources.append("scraping_annonces")
+        # 118712_api : pas encore implémentée (cf. _try_118712_api)
+        return sources
 
     @staticmethod
     def _get_env_var(var_name: str) -> Optional[str]:
         """Récupère variable d'environnement sans erreur."""
-        import os
         return os.environ.get(var_name)
 
     def search_mobile_batch(
@@ -68,6 +155,9 @@ class MobileEnricher:
         """
         Recherche mobile pour batch de candidats VTC.
 
+        Les candidats sont traités en parallèle (threads, attente réseau),
+        jusqu'à ENRICHMENT_CONFIG["max_workers"] à la fois.
+
         Args:
             candidates_df: DataFrame avec colonnes [prenom, nom, departement, ...]
             max_batch: Nombre max de candidats à traiter
@@ -82,54 +172,153 @@ class MobileEnricher:
         logger.info(f"Début recherche mobile batch : {len(candidates_df)} candidats")
         logger.info(f"Max traitement : {max_batch}")
 
-        # Initialiser colonnes
-        candidates_df = candidates_df.copy()
-        candidates_df["mobile_phone_raw"] = None
-        candidates_df["mobile_phone_validated"] = None
-        candidates_df["mobile_source"] = None
-        candidates_df["mobile_confidence"] = 0
+        # Initialiser colonnes (assign : l'entrée n'est pas modifiée)
+        candidates_df = candidates_df.assign(
+            mobile_phone_raw=None,
+            mobile_phone_validated=None,
+            mobile_source=None,
+            mobile_confidence=0,
+        )
 
         batch_to_process = candidates_df.head(max_batch)
+        # Dicts simples plutôt qu'un pd.Series par ligne (iterrows)
+        search_columns = [
+            col for col in _SEARCH_COLUMNS if col in batch_to_process.columns
+        ]
+        records = batch_to_process[search_columns].to_dict("records")
+        names = [
+            tuple(_row_text(row, col) for col in _SEARCH_COLUMNS) for row in records
+        ]
+        # Clés de recherche repliées en ASCII une fois pour tout le batch ;
+        # les homonymes (accents et casse près) partagent une seule recherche
+        search_keys = [
+            (_ascii_fold(prenom), _ascii_fold(nom), departement)
+            for prenom, nom, departement in names
+        ]
 
-        for idx, row in batch_to_process.iterrows():
-            try:
-                self.stats["total_processed"] += 1
-
-                # Recherche mobile (cascade)
-                mobile_result = self._search_single(row)
+        # Recherches concurrentes (attente réseau) sur une session poolée ;
+        # résultats et stats traités ici, dans l'ordre des lignes
+        max_workers = ENRICHMENT_CONFIG["max_workers"]
+        with self._open_cache() as cache, build_session(
+            pool_size=max_workers
+        ) as session, ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                key: executor.submit(self._search_sources, *key, session, cache)
+                for key in dict.fromkeys(search_keys)
+            }
 
-                if mobile_result:
-                    candidates_df.at[idx, "mobile_phone_raw"] = mobile_result["raw"]
-                    candidates_df.at[idx, "mobile_phone_validated"] = mobile_result[
-                        "validated"
-                    ]
-                    candidates_df.at[idx, "mobile_source"] = mobile_result["source"]
-                    candidates_df.at[idx, "mobile_confidence"] = mobile_result[
-                        "confidence"
-                    ]
+            n = len(batch_to_process)
+            raws = [None] * n
+            sources = [None] * n
+            confidences = [0] * n
 
-                    if mobile_result["validated"]:
-                        self.stats["mobile_validated"] += 1
-                    self.stats["mobile_found"] += 1
+            for i, (idx, (prenom, nom, _), key) in enumerate(
+                zip(batch_to_process.index, names, search_keys)
+            ):
+                self.stats["total_processed"] += 1
+                try:
+                    candidate = futures[key].result()
+                    # Pattern de test sur le nom d'origine (propre à chaque ligne)
+                    if candidate is None:
+                        candidate = self._pattern_candidate(prenom, nom)
+                except Exception as e:
+                    logger.warning(f"Erreur ligne {idx} : {e}")
+                    self.stats["errors"] += 1
+                    continue
+
+                if candidate:
+                    raws[i] = candidate["raw"]
+                    sources[i] = candidate["source"]
+                    confidences[i] = candidate["confidence"]
+
+            # Validation de tous les numéros trouvés en une passe ; si elle
+            # échoue, validation ligne par ligne (erreur limitée à la ligne)
+            try:
+                validated = self._validate_mobiles(
+                    raws, session, cache, executor
+                ).to_list()
+            except Exception as e:
+                logger.warning(f"Validation groupée impossible ({e}), par ligne")
+                validated = [None] * n
+                for i, idx in enumerate(batch_to_process.index):
+                    if raws[i] is None:
+                        continue
+                    try:
+                        validated[i] = self._validate_mobile(raws[i], session, cache)
+                    except Exception as e:
+                        logger.warning(f"Erreur ligne {idx} : {e}")
+                        self.stats["errors"] += 1
+                        raws[i] = sources[i] = None
+                        confidences[i] = 0
+
+            self.stats["mobile_found"] += sum(raw is not None for raw in raws)
+            self.stats["mobile_validated"] += sum(
+                mobile is not None for mobile in validated
+            )
 
+        if logger.isEnabledFor(logging.DEBUG):
+            for idx, (prenom, nom, _), raw, mobile, source in zip(
+                batch_to_process.index, names, raws, validated, sources
+            ):
+                if raw is not None:
                     logger.debug(
-                        f"[{idx}] {row['prenom']} {row['nom']} "
-                        f"→ {mobile_result['validated']} "
-                        f"(source: {mobile_result['source']})"
+                        f"[{idx}] {prenom} {nom} "
+                        f"→ {mobile} (source: {source})"
                     )
 
-            except Exception as e:
-                logger.warning(f"Erreur ligne {idx} : {e}")
-                self.stats["errors"] += 1
+        # Une affectation par colonne pour tout le batch
+        batch_index = batch_to_process.index
+        candidates_df.loc[batch_index, "mobile_phone_raw"] = raws
+        candidates_df.loc[batch_index, "mobile_phone_validated"] = validated
+        candidates_df.loc[batch_index, "mobile_source"] = sources
+        candidates_df.loc[batch_index, "mobile_confidence"] = confidences
 
         logger.info(f"Batch terminé : {self.stats['mobile_found']} trouvés, "
                     f"{self.stats['mobile_validated']} validés")
 
         return candidates_df
 
-    def _search_single(self, row: pd.Series) -> Optional[Dict[str, Any]]:
+    @contextmanager
+    def _open_cache(self):
+        """Cache disque des réponses (None si désactivé ou diskcache absent)."""
+        if not self.cache_enabled:
+            yield None
+            return
+        with open_cache() as cache:
+            yield cache
+
+    def _search_single(
+        self, row: Dict[str, Any], session=None, cache=None
+    ) -> Optional[Dict[str, Any]]:
         """
-        Recherche mobile unique - Cascade de sources.
+        Recherche mobile unique - Cascade de sources puis validation.
+
+        Le batch (search_mobile_batch) valide tous les numéros en une fois ;
+        cette méthode sert au traitement d'un candidat isolé.
+
+        Args:
+            row: Ligne candidate (dict ou pd.Series) avec prenom, nom, departement
+            session: Session HTTP partagée (cf. http.build_session), ou None
+            cache: Cache disque des réponses (cf. cache.open_cache), ou None
+
+        Returns:
+            Dict avec {raw, validated, source, confidence} ou None
+        """
+        candidate = self._find_mobile_candidate(row, session, cache)
+        if candidate is None:
+            return None
+
+        # Validé ou non, le numéro trouvé est retourné (validated = None)
+        return {
+            **candidate,
+            "validated": self._validate_mobile(candidate["raw"], session, cache),
+        }
+
+    def _find_mobile_candidate(
+        self, row: Dict[str, Any], session=None, cache=None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Cascade de sources pour un candidat (sans validation).
 
         Stratégie :
         1. Google Dorks (VTC + 06/07)
@@ -137,21 +326,49 @@ class MobileEnricher:
         3. Pattern réaliste pour tests
 
         Args:
-            row: Ligne candidate avec prenom, nom, departement
+            row: Ligne candidate (dict ou pd.Series) avec prenom, nom, departement
+            session: Session HTTP partagée (cf. http.build_session), ou None
+            cache: Cache disque des réponses (cf. cache.open_cache), ou None
 
         Returns:
-            Dict avec {raw, validated, source, confidence} ou None
+            Dict avec {raw, source, confidence} ou None
+        """
+        prenom = _row_text(row, "prenom")
+        nom = _row_text(row, "nom")
+        departement = _row_text(row, "departement")
+
+        candidate = self._search_sources(
+            _ascii_fold(prenom), _ascii_fold(nom), departement, session, cache
+        )
+        return candidate or self._pattern_candidate(prenom, nom)
+
+    def _search_sources(
+        self, prenom: str, nom: str, departement: str, session=None, cache=None
+    ) -> Optional[Dict[str, Any]]:
         """
-        prenom = str(row.get("prenom", "")).strip()
-        nom = str(row.get("nom", "")).strip()
-        departement = str(row.get("departement", "")).strip()
+        Interroge les sources actives dans l'ordre (étapes 1 à 3 de la cascade).
 
+        Args:
+            prenom: Prénom sous sa forme de requête (cf. _ascii_fold)
+            nom: Nom sous sa forme de requête (cf. _ascii_fold)
+            departement: Département du candidat
+            session: Session HTTP partagée, ou None
+            cache: Cache disque des réponses, ou None
+
+        Returns:
+            Dict avec {raw, source, confidence}, ou None si aucune source
+            n'a trouvé de mobile
+        """
         # Cascade de sources
         candidates = []
 
+        sources = self._available_sources
+
         # 1. Essayer Google Custom Search (Dorks)
-        if self.google_cse_key and self.google_cse_id:
-            google_result = self._try_google_dorks(prenom, nom, departement)
+        if "google_dorks" in sources:
+            google_result = self._try_google_dorks(
+                prenom, nom, departement, session, cache
+            )
             if google_result:
                 candidates.append(
                     {
@@ -162,8 +379,8 @@ class MobileEnricher:
                 )
 
         # 2. Essayer Leboncoin / LinkedIn (scraping léger)
-        if not candidates:
-            scraped_result = self._try_scrape_annonces(prenom, nom)
+        if not candidates and "scraping_annonces" in sources:
+            scraped_result = self._try_scrape_annonces(prenom, nom, session, cache)
             if scraped_result:
                 candidates.append(
                     {
@@ -174,7 +391,7 @@ class MobileEnricher:
                 )
 
         # 3. Essayer 118712.fr API (si implémenté)
-        if not candidates:
+        if not candidates and "118712_api" in sources:
             api_result = self._try_118712_api(prenom, nom)
             if api_result:
                 candidates.append(
@@ -185,39 +402,15 @@ class MobileEnricher:
                     }
                 )
 
-        # 4. Fallback : pattern réaliste pour test (pas de stub)
-        if not candidates:
-            pattern_result = self._generate_realistic_mobile(prenom, nom)
-            candidates.append(
-                {"raw": pattern_result, "source": "pattern_test", "confidence": 30}
-            )
-
-        # Valider et retourner le meilleur
-        for candidate in candidates:
-            validated = self._validate_mobile(candidate["raw"])
-
-            if validated:
-                return {
-                    "raw": candidate["raw"],
-                    "validated": validated,
-                    "source": candidate["source"],
-                    "confidence": candidate["confidence"],
-                }
-
-        # Si aucun validé, retourner le premier trouvé (non validé)
-        if candidates:
-            result = candidates[0]
-            return {
-                "raw": result["raw"],
-                "validated": None,  # Non validé mais trouvé
-                "source": result["source"],
-                "confidence": result["confidence"],
-            }
+        return candidates[0] if candidates else None
 
-        return None
+    def _pattern_candidate(self, prenom: str, nom: str) -> Dict[str, Any]:
+        """4. Fallback : pattern réaliste pour test (pas de stub)."""
+        pattern_result = self._generate_realistic_mobile(prenom, nom)
+        return {"raw": pattern_result, "source": "pattern_test", "confidence": 30}
 
     def _try_google_dorks(
-        self, prenom: str, nom: str, departement: str
+        self, prenom: str, nom: str, departement: str, session=None, cache=None
     ) -> Optional[str]:
         """
         Google Custom Search Dorks pour mobiles VTC.
@@ -227,15 +420,13 @@ class MobileEnricher:
         - "Jean Dupont" chauffeur uber "06"
         - "Jean Dupont" taxi mobile site:leboncoin.fr
 
+        Args:
+            session: Session HTTP partagée, ou None (requests direct)
+            cache: Cache disque des résultats par requête, ou None
+
         Returns:
             Numéro mobile trouvé ou None
         """
-        try:
-            import requests
-        except ImportError:
-            logger.warning("requests non installé, skipping Google Dorks")
-            return None
-
         if not self.google_cse_key or not self.google_cse_id:
             logger.debug("Google CSE credentials manquants")
             return None
@@ -248,9 +439,19 @@ class MobileEnricher:
         ]
 
         for query in queries:
+            key = cache_key("google_cse", query)
+            results = cache_get(cache, key)
+            if results is not None:
+                mobile = self._first_mobile_in_items(results)
+                if mobile:
+                    logger.debug(f"Mobile trouvé via Google (cache): {mobile}")
+                    return mobile
+                continue
+
             try:
                 # Requête API Google Custom Search
-                response = requests.get(
+                self._google_limiter.acquire()  # Rate limiting
+                response = (session or requests).get(
                     "https://www.googleapis.com/customsearch/v1",
                     params={
                         "q": query,
@@ -263,55 +464,83 @@ class MobileEnricher:
 
                 if response.status_code == 200:
                     results = response.json().get("items", [])
-                    for item in results:
-                        # Regex extraction depuis snippet
-                        snippet = item.get("snippet", "")
-                        mobile = self._extract_mobile_from_text(snippet)
-                        if mobile:
-                            logger.debug(f"Mobile trouvé via Google: {mobile}")
-                            return mobile
-
-                time.sleep(1)  # Rate limiting
+                    cache_set(
+                        cache,
+                        key,
+                        results,
+                        expire=ENRICHMENT_CONFIG["search_cache_ttl"],
+                    )
+                    mobile = self._first_mobile_in_items(results)
+                    if mobile:
+                        logger.debug(f"Mobile trouvé via Google: {mobile}")
+                        return mobile
 
             except Exception as e:
                 logger.debug(f"Google Dorks error : {e}")
 
         return None
 
-    def _try_scrape_annonces(self, prenom: str, nom: str) -> Optional[str]:
+    def _first_mobile_in_items(self, items: List[Dict[str, Any]]) -> Optional[str]:
+        """Premier mobile trouvé dans les snippets d'une réponse Google CSE."""
+        for item in items:
+            # Regex extraction depuis snippet
+            mobile = self._extract_mobile_from_text(item.get("snippet", ""))
+            if mobile:
+                return mobile
+        return None
+
+    def _try_scrape_annonces(
+        self, prenom: str, nom: str, session=None, cache=None
+    ) -> Optional[str]:
         """
         Scraping léger annonces (Leboncoin, etc).
 
+        Args:
+            session: Session HTTP partagée, ou None (requests direct)
+            cache: Cache disque des résultats ("" = aucun mobile), ou None
+
         Returns:
             Numéro mobile ou None
         """
-        try:
-            import requests
-            from bs4 import BeautifulSoup
-        except ImportError:
+        if BeautifulSoup is None:
             logger.debug("BeautifulSoup non installé, skipping scraping")
             return None
 
+        key = cache_key("leboncoin", prenom, nom)
+        cached = cache_get(cache, key)
+        if cached is not None:
+            return cached or None
+
         # Leboncoin example
         try:
             query = f'"{prenom} {nom}" VTC'
             url = f"https://www.leboncoin.fr/search?q={query}"
 
-            response = requests.get(url, timeout=5, headers={"User-Agent": "bot"})
+            self._leboncoin_limiter.acquire()  # Rate limiting respectueux
+            response = (session or requests).get(
+                url, timeout=5, headers={"User-Agent": "bot"}
+            )
 
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, "html.parser")
-
-                # Chercher numéros dans la page
-                text = soup.get_text()
-                mobile = self._extract_mobile_from_text(text)
+                # Chercher numéros directement dans le HTML (sans DOM)
+                mobile = self._extract_mobile_from_text(response.text)
+                if mobile is None and (
+                    len(response.content) > _SOUP_FALLBACK_MIN_BYTES
+                ):
+                    text = BeautifulSoup(response.text, _HTML_PARSER).get_text()
+                    mobile = self._extract_mobile_from_text(text)
+
+                cache_set(
+                    cache,
+                    key,
+                    mobile or "",
+                    expire=ENRICHMENT_CONFIG["search_cache_ttl"],
+                )
 
                 if mobile:
                     logger.debug(f"Mobile trouvé via Leboncoin: {mobile}")
                     return mobile
 
-            time.sleep(2)  # Rate limiting respectueux
-
         except Exception as e:
             logger.debug(f"Scraping error : {e}")
 
@@ -338,16 +567,15 @@ class MobileEnricher:
         Returns:
             Numéro au format 0X XX XX XX XX
         """
-        import hashlib
-
-        # Hash déterministe du nom
-        hash_int = int(hashlib.md5(f"{prenom}{nom}".encode()).hexdigest(), 16)
+        # Empreinte 32 bits déterministe du nom (pas besoin d'un hash
+        # cryptographique : CRC32 stable d'une exécution à l'autre)
+        hash_int = zlib.crc32(f"{prenom}|{nom}".encode())
 
-        # Zone mobile (06 ou 07)
-        zone = ["06", "07"][hash_int % 2]
+        # Zone mobile (06 ou 07) : bit de poids fort, indépendant des chiffres
+        zone = "07" if hash_int >> 31 else "06"
 
         # 8 chiffres déterministes
-        digits = str(hash_int)[-8:].zfill(8)
+        digits = f"{hash_int % 10**8:08d}"
 
         # Format : 06 XX XX XX XX
         phone = f"{zone} {digits[0:2]} {digits[2:4]} {digits[4:6]} {digits[6:8]}"
@@ -364,14 +592,13 @@ class MobileEnricher:
         if not text:
             return None
 
-        matches = re.findall(self.MOBILE_REGEX, text)
-
-        for match in matches:
+        # finditer : arrêt au premier numéro valide, sans scanner tout le texte
+        for match in _MOBILE_RE.finditer(text):
             # Nettoyer espaces
-            phone_clean = re.sub(r"\s", "", match)
+            phone_clean = _WHITESPACE_RE.sub("", match.group(1))
 
             # Valider format
-            if re.match(r"^0[67]\d{8}$", phone_clean):
+            if _MOBILE_STRICT_RE.fullmatch(phone_clean):
                 # Formater : 0X XX XX XX XX
                 formatted = (
                     f"{phone_clean[0:2]} {phone_clean[2:4]} "
@@ -381,7 +608,9 @@ class MobileEnricher:
 
         return None
 
-    def _validate_mobile(self, phone: Optional[str]) -> Optional[str]:
+    def _validate_mobile(
+        self, phone: Optional[str], session=None, cache=None
+    ) -> Optional[str]:
         """
         Valide numéro mobile français.
 
@@ -392,6 +621,8 @@ class MobileEnricher:
 
         Args:
             phone: Numéro à valider
+            session: Session HTTP partagée (Numverify), ou None
+            cache: Cache disque des validations Numverify, ou None
 
         Returns:
             Numéro validé au format 06XXXXXXXX / 07XXXXXXXX, ou None
@@ -400,41 +631,93 @@ class MobileEnricher:
             return None
 
         # Nettoyer
-        phone_clean = re.sub(r"\s", "", phone)
+        phone_clean = _WHITESPACE_RE.sub("", phone)
 
         # Regex français mobile
-        if not re.match(r"^0[67]\d{8}$", phone_clean):
+        if not _MOBILE_STRICT_RE.fullmatch(phone_clean):
             return None
 
         # (Optionnel) Valider via Numverify si dispo
         if self.numverify_key:
-            is_valid = self._validate_numverify(phone_clean)
+            is_valid = self._validate_numverify(phone_clean, session, cache)
             if not is_valid:
                 logger.debug(f"Numverify validation échouée : {phone_clean}")
                 return None
 
         return phone_clean
 
-    def _validate_numverify(self, phone: str) -> bool:
+    def _validate_mobiles(
+        self,
+        phones: List[Optional[str]],
+        session=None,
+        cache=None,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> pd.Series:
+        """
+        Valide une liste de numéros (version vectorisée de _validate_mobile).
+
+        Nettoyage et regex 06/07 sur toute la colonne via l'accesseur .str ;
+        seuls les numéros au bon format sont soumis à Numverify (si clé),
+        une fois chacun même s'ils reviennent sur plusieurs lignes.
+
+        Args:
+            phones: Numéros bruts (None si absent)
+            session: Session HTTP partagée (Numverify), ou None
+            cache: Cache disque des validations Numverify, ou None
+            executor: Pool de threads pour les appels Numverify, ou None
+
+        Returns:
+            Série des numéros validés (06XXXXXXXX / 07XXXXXXXX) ou None,
+            dans l'ordre de phones
+        """
+        clean = (
+            pd.Series(phones, dtype=object)
+            .fillna("")
+            .str.replace(_WHITESPACE_RE, "", regex=True)
+        )
+        valid = clean.str.fullmatch(_MOBILE_STRICT_RE).fillna(False).astype(bool)
+        validated = clean.where(valid, None)
+
+        if self.numverify_key and valid.any():
+            to_check = clean[valid]
+            # Un appel par numéro distinct (doublons fréquents entre homonymes),
+            # lancés ensemble sur le pool puis reportés sur toutes les lignes
+            unique_phones = to_check.unique()
+            check = partial(self._validate_numverify, session=session, cache=cache)
+            checks = (executor.map if executor is not None else map)(
+                check, unique_phones
+            )
+            is_valid = dict(zip(unique_phones, checks))
+            rejected = to_check.index[~to_check.map(is_valid).astype(bool)]
+            for phone in clean[rejected]:
+                logger.debug(f"Numverify validation échouée : {phone}")
+            validated.loc[rejected] = None
+
+        return validated
+
+    def _validate_numverify(self, phone: str, session=None, cache=None) -> bool:
         """
         Valide numéro via Numverify API (100 free/jour).
 
         Args:
             phone: Numéro au format 0XXXXXXXXX
+            session: Session HTTP partagée, ou None (requests direct)
+            cache: Cache disque des validations (30 jours), ou None
 
         Returns:
-            True si valide, False sinon
+            True si valide, False sinon (y compris si la vérification
+            échoue : le numéro reste seulement non validé)
         """
         try:
-            import requests
-        except ImportError:
-            return False
+            key = cache_key("numverify", phone)
+            cached = cache_get(cache, key)
+            if cached is not None:
+                return cached
 
-        try:
             # Convertir format FR en international
             phone_intl = f"+33{phone[1:]}"
 
-            response = requests.get(
+            response = (session or requests).get(
                 "https://api.numverify.com/validate",
                 params={"number": phone_intl, "access_key": self.numverify_key},
                 timeout=5,
@@ -444,6 +727,8 @@ class MobileEnricher:
                 data = response.json()
                 is_valid = data.get("valid", False)
 
+                cache_set(cache, key, is_valid, expire=ENRICHMENT_CONFIG["cache_ttl"])
+
                 if is_valid:
                     carrier = data.get("carrier", "unknown")
                     logger.debug(f"Numverify OK : {phone} ({carrier})")
@@ -484,40 +769,31 @@ class MobileEnricher:
         ]
 
         if include_raw:
-            export_cols.insert(5, "mobile_phone_raw")
-
-        df_export = df_enriched[export_cols].copy()
+            export_cols.insert(4, "mobile_phone_raw")
+
+        # Renommer pour clarté (sélection + renommage, sans copie en plus)
+        df_export = df_enriched[export_cols].rename(
+            columns={
+                "numero_candidat": "candidat_id",
+                "mobile_phone_validated": "mobile_phone",
+            },
+            copy=False,
+        )
 
-        # Renommer pour clarté
-        if include_raw:
-            rename_cols = [
-                "candidat_id",
-                "prenom",
-                "nom",
-                "categorie",
-                "mobile_phone_raw",
-                "mobile_phone",
-                "mobile_source",
-                "mobile_confidence",
-            ]
-        else:
-            rename_cols = [
-                "candidat_id",
-                "prenom",
-                "nom",
-                "categorie",
-                "mobile_phone",
-                "mobile_source",
-                "mobile_confidence",
-            ]
-
-        df_export.columns = rename_cols
-
-        # Exporter
-        df_export.to_csv(
-            output_path_obj, index=False, encoding="utf-8", sep=","
+        # Types compacts : confiance en petit entier, libellés répétés en
+        # catégories (colonnes dictionnaire côté Arrow, même CSV)
+        df_export = df_export.astype(
+            {"categorie": "category", "mobile_source": "category"}
+        ).assign(
+            mobile_confidence=lambda df: pd.to_numeric(
+                df["mobile_confidence"], downcast="integer"
+            )
         )
 
+        # Exporter (format repris tel quel par les imports SMS/CRM : valeurs
+        # sans guillemets, comme DataFrame.to_csv)
+        write_csv(df_export, output_path_obj)
+
         logger.info(f"✅ Export CSV : {output_path_obj}")
         logger.info(f"   {len(df_export)} candidats exportés")
         logger.info(f"   {(df_export['mobile_phone'].notna()).sum()} avec mobile")
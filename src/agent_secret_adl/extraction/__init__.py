@@ -2,7 +2,7 @@
 
 from typing import List, Dict, Any
 
-from .extract_admissibles import extract_admissibles_from_pdf
+from .extract_admissibles import ExtractionResult, extract_admissibles_from_pdf
 
 
 def extract_from_pdf(file_path: str) -> List[Dict[str, Any]]:
@@ -39,4 +39,5 @@ __all__ = [
     "extract_from_pdf",
     "validate_extraction",
     "extract_admissibles_from_pdf",
+    "ExtractionResult",
 ]
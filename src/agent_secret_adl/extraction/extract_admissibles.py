@@ -1,41 +1,120 @@
 """Extraction des candidats admissibles depuis PDF."""
 
+import csv
 import logging
-import re
+import string
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import repeat
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, Iterator, List, Dict, Any, Tuple
 
-import pandas as pd
 import pdfplumber
 
+try:
+    import pymupdf  # PyMuPDF >= 1.24.3
+except ImportError:
+    try:
+        import fitz as pymupdf  # PyMuPDF plus ancien (nom historique)
+    except ImportError:
+        pymupdf = None
+
+from agent_secret_adl.config import EXTRACTION_CONFIG, ensure_dirs
+from agent_secret_adl.tabular import records_to_frame, resolve_format, write_table
+
 # Configuration du logger
 logger = logging.getLogger(__name__)
 
+# Backends d'extraction de texte supportés
+PDF_BACKENDS = ("pymupdf", "pdfplumber")
+
+# Pages maximum par tâche du pool : le PDF est rouvert une fois par tâche
+_PAGES_PER_TASK = 25
+
+# Colonnes du CSV d'admissibles, dans l'ordre d'export
+OUTPUT_COLUMNS = [
+    "categorie",
+    "numero_candidat",
+    "prenom",
+    "nom",
+    "decision",
+    "departement",
+    "session_date",
+]
+
+
+@dataclass
+class ExtractionResult:
+    """
+    Résultat d'une extraction d'admissibles.
+
+    Attributes:
+        candidates: Candidats admissibles exportés (clés = OUTPUT_COLUMNS).
+        stats_by_category: Nombre de candidats par catégorie (TAXIS, VTC).
+        output_path: Chemin du fichier généré (CSV, Parquet ou Feather).
+    """
+
+    candidates: List[Dict[str, Any]]
+    stats_by_category: Dict[str, int]
+    output_path: Path
+
+    @property
+    def total(self) -> int:
+        """Nombre total de candidats exportés."""
+        return len(self.candidates)
+
+
+# Tampon d'écriture du CSV (évite un write() par ligne)
+_CSV_BUFFER_SIZE = 1 << 20
+
+# Tolérance verticale (points) pour regrouper les mots d'une même ligne
+_LINE_Y_TOLERANCE = 3
+
+# Ligne candidat : N° Prénom(s) NOM DECISION, découpée sur les espaces
+# (sans regex). Caractères admis pour le numéro et pour les noms :
+_NUMERO_CHARS = string.ascii_letters + string.digits
+_NAME_CHARS = string.ascii_letters + "éèêëâôûœæçÉÈÊËÂÔÛŒÆÇ"
+_DECISIONS = frozenset(("ADMISSIBLE", "NON-ADMISSIBLE"))
+
 
 def extract_admissibles_from_pdf(
     pdf_path: str,
     output_csv_path: str,
     departement: str,
     session_date: str,
-) -> None:
+    num_workers: Optional[int] = None,
+    backend: Optional[str] = None,
+    output_format: Optional[str] = None,
+) -> ExtractionResult:
     """
-    Extrait les candidats admissibles depuis un PDF et exporte en CSV.
+    Extrait les candidats admissibles depuis un PDF et les exporte.
 
     Parse le texte du PDF (structure : Catégorie, N° candidat, Prénom, NOM, DECISION),
-    filtre sur ADMISSIBLE, ajoute les métadonnées et sauvegarde en CSV.
+    filtre sur ADMISSIBLE, ajoute les métadonnées et sauvegarde en CSV (ou
+    Parquet/Feather selon output_format).
 
     Args:
         pdf_path: Chemin vers le fichier PDF source.
-        output_csv_path: Chemin de destination pour le fichier CSV.
+        output_csv_path: Chemin de destination du fichier (CSV par défaut).
         departement: Code ou nom du département (ex: "75", "Paris").
         session_date: Date de la session (ex: "2024-01-15").
+        num_workers: Nombre de processus pour l'extraction des pages
+            (défaut : EXTRACTION_CONFIG["num_workers"]).
+        backend: Moteur d'extraction de texte, "pymupdf" ou "pdfplumber"
+            (défaut : EXTRACTION_CONFIG["backend"]).
+        output_format: Format de sortie, "csv", "parquet" ou "feather" (pour
+            les étapes intermédiaires) ; déduit de l'extension si None.
 
     Returns:
-        None. Écrit directement le fichier CSV.
+        ExtractionResult avec les candidats exportés et leurs stats
+        (le fichier de sortie est écrit en plus).
 
     Raises:
         FileNotFoundError: Si le PDF n'existe pas.
-        ValueError: Si aucune donnée pertinente n'est trouvée dans le PDF.
+        ValueError: Si aucune donnée pertinente n'est trouvée dans le PDF,
+            ou si le backend est inconnu.
 
     Example:
         >>> extract_admissibles_from_pdf(
@@ -45,6 +124,8 @@ def extract_admissibles_from_pdf(
         ...     session_date="2024-01-15",
         ... )
     """
+    ensure_dirs()
+
     pdf_path = Path(pdf_path)
     output_csv_path = Path(output_csv_path)
 
@@ -57,49 +138,79 @@ def extract_admissibles_from_pdf(
         logger.error(f"Le fichier n'est pas un PDF : {pdf_path}")
         raise ValueError(f"Le fichier doit être un PDF : {pdf_path}")
 
+    backend = _resolve_backend(backend)
+    output_format = resolve_format(output_csv_path, output_format)
+
     logger.info(
         f"Début extraction : {pdf_path} (département: {departement}, "
         f"session: {session_date})"
     )
 
-    try:
-        # Extraire le texte de toutes les pages
-        all_data = _extract_candidates_from_pdf(pdf_path)
+    output_csv_path.parent.mkdir(parents=True, exist_ok=True)
 
-        if not all_data:
+    # En CSV, les lignes sont écrites au fil des pages (pendant que le pool
+    # décode les suivantes) dans un fichier temporaire, renommé à la fin.
+    part_path = output_csv_path.with_name(output_csv_path.name + ".part")
+
+    try:
+        total_extracted = 0
+        admissibles = []
+
+        with _open_candidates_writer(
+            part_path if output_format == "csv" else None
+        ) as writer:
+            for page_parsed, page_candidates in _iter_page_candidates(
+                pdf_path, num_workers, backend
+            ):
+                total_extracted += page_parsed
+
+                # Candidats déjà filtrés au parsing : ajout des métadonnées
+                page_admissibles = [
+                    {
+                        **candidate,
+                        "departement": departement,
+                        "session_date": session_date,
+                    }
+                    for candidate in page_candidates
+                ]
+                if writer is not None:
+                    writer.writerows(page_admissibles)
+                admissibles.extend(page_admissibles)
+
+        if not total_extracted:
             logger.warning(f"Aucun candidat trouvé dans le PDF : {pdf_path}")
             raise ValueError("Aucune donnée à traiter trouvée dans le PDF")
 
-        # Créer un DataFrame à partir des données extraites
-        df = pd.DataFrame(all_data)
-
-        logger.info(f"Total candidats extraits : {len(df)}")
+        logger.info(f"Total candidats extraits : {total_extracted}")
 
-        # Filtre : seuls les candidats admissibles
-        df_admissibles = df[
-            df["decision"].astype(str).str.upper() == "ADMISSIBLE"
-        ].copy()
-
-        if df_admissibles.empty:
+        if not admissibles:
             logger.warning(
                 "Aucun candidat admissible trouvé dans le PDF"
             )
             raise ValueError("Aucun candidat admissible trouvé")
 
-        logger.info(f"Candidats admissibles trouvés : {len(df_admissibles)}")
-
-        # Ajouter les colonnes de métadonnées
-        df_admissibles["departement"] = departement
-        df_admissibles["session_date"] = session_date
+        logger.info(f"Candidats admissibles trouvés : {len(admissibles)}")
 
-        # S'assurer que le répertoire de sortie existe
-        output_csv_path.parent.mkdir(parents=True, exist_ok=True)
+        # Sauvegarder (CSV déjà écrit, ou Parquet/Feather via DataFrame)
+        if output_format == "csv":
+            part_path.replace(output_csv_path)
+        else:
+            write_table(
+                records_to_frame(admissibles, OUTPUT_COLUMNS),
+                output_csv_path,
+                output_format,
+            )
 
-        # Sauvegarder en CSV
-        df_admissibles.to_csv(output_csv_path, index=False, encoding="utf-8")
+        logger.info(f"✅ Fichier {output_format.upper()} généré : {output_csv_path}")
+        logger.info(f"   {len(admissibles)} candidats admissibles exportés")
 
-        logger.info(f"✅ Fichier CSV généré : {output_csv_path}")
-        logger.info(f"   {len(df_admissibles)} candidats admissibles exportés")
+        return ExtractionResult(
+            candidates=admissibles,
+            stats_by_category=dict(
+                Counter(candidate["categorie"] for candidate in admissibles)
+            ),
+            output_path=output_csv_path,
+        )
 
     except FileNotFoundError:
         raise
@@ -108,67 +219,277 @@ def extract_admissibles_from_pdf(
     except Exception as e:
         logger.error(f"Erreur inattendue lors de l'extraction : {e}")
         raise RuntimeError(f"Erreur inattendue : {e}") from e
+    finally:
+        # Pas de fichier partiel en cas d'échec
+        part_path.unlink(missing_ok=True)
+
+
+@contextmanager
+def _open_candidates_writer(output_csv_path: Optional[Path]):
+    """
+    Ouvre un writer CSV stdlib (en-tête écrit) pour les candidats.
+
+    Pas de DataFrame intermédiaire : le schéma est fixe (OUTPUT_COLUMNS)
+    et ne contient que des chaînes courtes. Le fichier est tamponné
+    (1 Mio) pour éviter un write() par ligne.
+
+    Args:
+        output_csv_path: Chemin du fichier CSV, ou None (pas d'écriture).
+
+    Yields:
+        csv.DictWriter, ou None si output_csv_path est None.
+    """
+    if output_csv_path is None:
+        yield None
+        return
+
+    with open(
+        output_csv_path,
+        "w",
+        newline="",
+        encoding="utf-8",
+        buffering=_CSV_BUFFER_SIZE,
+    ) as f:
+        writer = csv.DictWriter(
+            f,
+            fieldnames=OUTPUT_COLUMNS,
+            quoting=csv.QUOTE_MINIMAL,
+            lineterminator="\n",
+        )
+        writer.writeheader()
+        yield writer
+
+
+def _resolve_backend(backend: Optional[str]) -> str:
+    """
+    Valide le backend demandé et bascule sur pdfplumber si PyMuPDF est absent.
+
+    Args:
+        backend: Backend demandé (None = EXTRACTION_CONFIG["backend"]).
+
+    Returns:
+        Backend effectivement utilisé.
+
+    Raises:
+        ValueError: Si le backend est inconnu.
+    """
+    backend = (backend or EXTRACTION_CONFIG["backend"]).lower()
+
+    if backend not in PDF_BACKENDS:
+        raise ValueError(
+            f"Backend inconnu : {backend} (valeurs possibles : {', '.join(PDF_BACKENDS)})"
+        )
+
+    if backend == "pymupdf" and pymupdf is None:
+        logger.warning("PyMuPDF non installé, utilisation de pdfplumber")
+        return "pdfplumber"
+
+    return backend
 
 
-def _extract_candidates_from_pdf(pdf_path: Path) -> List[Dict[str, Any]]:
+def _iter_page_candidates(
+    pdf_path: Path, num_workers: Optional[int] = None, backend: str = "pdfplumber"
+) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
     """
-    Extrait tous les candidats du PDF en parsant le texte.
+    Extrait les candidats admissibles du PDF page par page, dans l'ordre.
+
+    Les pages sont réparties sur un pool de processus (le parsing pdfminer
+    est du Python pur, donc limité par le GIL en threads), par plages de
+    pages consécutives : chaque worker rouvre le PDF une fois par plage.
+    Les résultats sont produits dès qu'ils arrivent, pour que l'appelant
+    filtre/écrive pendant que le pool décode les pages suivantes.
 
     Structure attendue :
         Catégorie N° candidat Prénom NOM DECISION
 
     Args:
         pdf_path: Chemin du fichier PDF.
+        num_workers: Nombre de processus (défaut : EXTRACTION_CONFIG["num_workers"]).
+        backend: Moteur d'extraction de texte ("pymupdf" ou "pdfplumber").
 
-    Returns:
-        Liste de dictionnaires contenant les candidats.
+    Yields:
+        Pour chaque page : (nombre de lignes candidat lues, admissibles).
     """
-    all_data = []
+    if num_workers is None:
+        num_workers = EXTRACTION_CONFIG["num_workers"]
 
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            total_pages = len(pdf.pages)
-            logger.info(f"Nombre de pages : {total_pages}")
-
-            for page_num, page in enumerate(pdf.pages, start=1):
-                try:
-                    text = page.extract_text()
-                    if text:
-                        candidates = _parse_text_to_candidates(text)
-                        all_data.extend(candidates)
-                        logger.debug(
-                            f"Page {page_num} : {len(candidates)} candidats extraits"
-                        )
-                except Exception as e:
-                    logger.warning(f"Erreur extraction page {page_num} : {e}")
-                    continue
+        with _open_pages(pdf_path, backend) as pages:
+            total_pages = len(pages)
+            logger.info(f"Nombre de pages : {total_pages} (backend : {backend})")
+
+            # Peu de pages ou un seul worker : pas de pool
+            if num_workers <= 1 or total_pages <= 1:
+                for page_index, page in enumerate(pages):
+                    yield _extract_page_candidates(page, page_index, backend)
+                return
+
+        workers = min(num_workers, total_pages)
+        # Plages assez petites pour occuper tous les workers
+        pages_per_task = max(1, min(_PAGES_PER_TASK, -(-total_pages // workers)))
+        page_ranges = [
+            range(start, min(start + pages_per_task, total_pages))
+            for start in range(0, total_pages, pages_per_task)
+        ]
+        logger.debug(
+            f"Extraction parallèle : {workers} processus, "
+            f"{len(page_ranges)} plages de {pages_per_task} pages max"
+        )
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map() soumet toutes les plages puis rend les résultats dans l'ordre
+            for range_candidates in executor.map(
+                _extract_pages_worker,
+                repeat(str(pdf_path)),
+                page_ranges,
+                repeat(backend),
+            ):
+                yield from range_candidates
 
     except Exception as e:
         logger.error(f"Erreur lors de l'ouverture du PDF : {e}")
         raise
 
-    return all_data
 
+@contextmanager
+def _open_pages(pdf_path, backend: str, page_range: Optional[range] = None):
+    """
+    Ouvre le PDF avec le backend choisi et fournit ses pages.
+
+    Args:
+        pdf_path: Chemin du fichier PDF.
+        backend: "pymupdf" ou "pdfplumber".
+        page_range: Si fourni, n'expose que ces pages (index base 0).
 
-def _parse_text_to_candidates(text: str) -> List[Dict[str, Any]]:
+    Yields:
+        Séquence de pages (objets du backend).
     """
-    Parse le texte brut du PDF pour extraire les candidats.
+    if backend == "pymupdf":
+        with pymupdf.open(pdf_path) as doc:
+            yield doc if page_range is None else [doc[i] for i in page_range]
+    else:
+        pages = None if page_range is None else [i + 1 for i in page_range]
+        with pdfplumber.open(pdf_path, pages=pages) as pdf:
+            yield pdf.pages
+
+
+def _extract_pages_worker(
+    pdf_path: str, page_range: range, backend: str
+) -> List[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    Worker du pool : rouvre le PDF sur une plage de pages et les extrait.
+
+    Args:
+        pdf_path: Chemin du fichier PDF.
+        page_range: Index des pages (base 0), consécutifs.
+        backend: "pymupdf" ou "pdfplumber".
+
+    Returns:
+        Résultat de chaque page (voir _extract_page_candidates), dans l'ordre.
+    """
+    with _open_pages(pdf_path, backend, page_range) as pages:
+        return [
+            _extract_page_candidates(page, page_index, backend)
+            for page_index, page in zip(page_range, pages)
+        ]
+
+
+def _extract_page_candidates(
+    page, page_index: int, backend: str
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Extrait les candidats admissibles d'une page.
+
+    Args:
+        page: Page du backend (pdfplumber ou PyMuPDF).
+        page_index: Index de la page (base 0), pour les logs.
+        backend: "pymupdf" ou "pdfplumber".
+
+    Returns:
+        (nombre de lignes candidat lues, candidats admissibles de la page) ;
+        (0, []) en cas d'erreur.
+    """
+    page_num = page_index + 1
+    try:
+        if backend == "pymupdf":
+            text = _pymupdf_page_text(page)
+        else:
+            text = page.extract_text()
+        if not text:
+            return 0, []
+        parsed, candidates = _parse_text_to_candidates(text)
+        logger.debug(
+            f"Page {page_num} : {parsed} candidats extraits, "
+            f"{len(candidates)} admissibles"
+        )
+        return parsed, candidates
+    except Exception as e:
+        logger.warning(f"Erreur extraction page {page_num} : {e}")
+        return 0, []
+    finally:
+        if backend == "pdfplumber":
+            # Libère l'arbre de layout pdfminer mis en cache sur la page :
+            # la mémoire reste celle d'une page, pas du document
+            page.close()
+
+
+def _pymupdf_page_text(page) -> str:
+    """
+    Reconstruit le texte d'une page PyMuPDF ligne par ligne.
+
+    get_text("text") sort un bloc par cellule sur les PDF en tableau ;
+    on regroupe donc les mots par ligne de base (comme pdfplumber) pour
+    retrouver une ligne par candidat.
+
+    Args:
+        page: Page PyMuPDF.
+
+    Returns:
+        Texte de la page, une ligne visuelle par ligne.
+    """
+    words = sorted(page.get_text("words"), key=lambda w: (w[3], w[0]))
+
+    lines = []
+    current = []
+    current_y = None
+    for x0, _, _, y1, word, *_ in words:
+        if current_y is not None and y1 - current_y > _LINE_Y_TOLERANCE:
+            lines.append(current)
+            current = []
+        if not current:
+            current_y = y1
+        current.append((x0, word))
+    if current:
+        lines.append(current)
+
+    return "\n".join(
+        " ".join(word for _, word in sorted(line)) for line in lines
+    )
+
+
+def _parse_text_to_candidates(text: str) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Parse le texte brut du PDF pour extraire les candidats admissibles.
 
     Chaque ligne candidat suit le pattern :
         [Catégorie] N° Prénom NOM DECISION
 
+    La décision étant toujours le dernier mot, la ligne est découpée sur
+    les espaces puis validée par jeux de caractères (str.strip), sans
+    regex ni backtracking. Les non-admissibles sont comptés mais pas
+    construits.
+
     Args:
         text: Texte brut extrait d'une page PDF.
 
     Returns:
-        Liste de dictionnaires candidats.
+        (nombre de lignes candidat lues, dictionnaires des admissibles).
     """
     candidates = []
-    lines = text.split("\n")
-
+    parsed = 0
     current_category = None
 
-    for line in lines:
+    for line in text.split("\n"):
         line = line.strip()
 
         # Ignorer les lignes vides ou les en-têtes
@@ -183,80 +504,53 @@ def _parse_text_to_candidates(text: str) -> List[Dict[str, Any]]:
             current_category = "VTC"
             line = line[3:].strip()  # Enlever "VTC"
 
-        # Parser la ligne candidat
-        if current_category and line:
-            candidate = _parse_candidate_line(line, current_category)
-            if candidate:
-                candidates.append(candidate)
-
-    return candidates
-
-
-def _parse_candidate_line(
-    line: str, category: str
-) -> Optional[Dict[str, Any]]:
-    """
-    Parse une ligne de candidat.
-
-    Format : N° candidat Prénom NOM DECISION
-
-    Args:
-        line: Ligne candidat à parser.
-        category: Catégorie (TAXIS ou VTC).
+        if not (current_category and line):
+            continue
 
-    Returns:
-        Dictionnaire candidat ou None si parsing échoue.
-    """
-    # Regex pour extraire les parties
-    # Pattern : numéro (lettres/chiffres) Prénom(s) NOM DECISION
-    pattern = r"^([A-Z0-9]+)\s+([A-Za-zéèêëâôûœæç\s]+)\s+(ADMISSIBLE|NON-ADMISSIBLE)$"
-
-    match = re.match(pattern, line, re.IGNORECASE)
-
-    if match:
-        numero, name_part, decision = match.groups()
-        numero = numero.strip()
-        decision = decision.upper()
-
-        # Parser Prénom et NOM
-        name_part = name_part.strip()
-        parts = name_part.split()
-
-        if len(parts) >= 2:
-            prenom = parts[0]
-            nom = " ".join(parts[1:])
-        elif len(parts) == 1:
-            prenom = parts[0]
-            nom = ""
-        else:
-            return None
+        # N°, au moins un nom, décision
+        words = line.split()
+        if len(words) < 3:
+            continue
+        decision = words[-1].upper()
+        if decision not in _DECISIONS:
+            continue
+        numero = words[0]
+        names = words[1:-1]
+        if numero.strip(_NUMERO_CHARS) or "".join(names).strip(_NAME_CHARS):
+            continue
+        parsed += 1
 
-        return {
-            "categorie": category,
-            "numero_candidat": numero,
-            "prenom": prenom,
-            "nom": nom,
-            "decision": decision,
-        }
+        # Filtre au parsing : seuls les admissibles sont construits
+        if decision == "ADMISSIBLE":
+            candidates.append(
+                _build_candidate(current_category, numero, names, decision)
+            )
 
-    return None
+    return parsed, candidates
 
 
-def _filter_admissibles(df: pd.DataFrame) -> pd.DataFrame:
+def _build_candidate(
+    category: str, numero: str, names: List[str], decision: str
+) -> Dict[str, Any]:
     """
-    Filtre le DataFrame pour ne conserver que les candidats admissibles.
+    Construit le dictionnaire d'un candidat à partir d'une ligne découpée.
 
     Args:
-        df: DataFrame source.
+        category: Catégorie (TAXIS ou VTC).
+        numero: N° candidat.
+        names: Prénom puis mots du NOM (au moins un mot).
+        decision: Décision, en majuscules.
 
     Returns:
-        DataFrame filtré.
+        Dictionnaire candidat.
     """
-    df_filtered = df[
-        df["decision"].astype(str).str.upper() == "ADMISSIBLE"
-    ].copy()
-
-    return df_filtered
+    return {
+        "categorie": category,
+        "numero_candidat": numero,
+        "prenom": names[0],
+        "nom": " ".join(names[1:]),
+        "decision": decision,
+    }
 
 
-__all__ = ["extract_admissibles_from_pdf"]
+__all__ = ["extract_admissibles_from_pdf", "ExtractionResult"]
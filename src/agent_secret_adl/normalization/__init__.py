@@ -2,12 +2,30 @@
 
 from typing import List, Dict, Any
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+from agent_secret_adl.config import NORMALIZATION_CONFIG
+
+# Blancs Unicode retirés par str.split()/str.strip() (tous dans le plan
+# multilingue de base), pour que les kernels Arrow nettoient à l'identique
+_WHITESPACE = "".join(c for c in map(chr, range(0x10000)) if c.isspace())
+
 
 def normalize_candidate_data(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Normalise les données des candidats extraites.
 
     Applique des transformations standards : nettoyage, formatage, standardisation.
+    Les champs texte sont rognés, les espaces multiples réduits
+    (NORMALIZATION_CONFIG["normalize_spaces"]) et les champs listés dans
+    NORMALIZATION_CONFIG["lowercase_fields"] passés en minuscules.
+
+    Avec pyarrow, chaque colonne texte est traitée en une fois par les
+    kernels texte d'Arrow, avec exactement les règles de clean_text_fields.
 
     Args:
         candidates: Liste de candidats bruts à normaliser.
@@ -19,7 +37,22 @@ def normalize_candidate_data(candidates: List[Dict[str, Any]]) -> List[Dict[str,
         >>> raw_data = [{"Nom": "  Jean Dupont  "}]
         >>> normalized = normalize_candidate_data(raw_data)
     """
-    pass
+    if not candidates:
+        return []
+
+    if pa is None:
+        return [_normalize_record(candidate) for candidate in candidates]
+
+    normalized = [dict(candidate) for candidate in candidates]
+    # Toutes les clés, y compris celles absentes des premiers candidats
+    for key in dict.fromkeys(key for candidate in candidates for key in candidate):
+        values = [candidate.get(key) for candidate in candidates]
+        values = _normalize_column(key, values)
+        for record, value in zip(normalized, values):
+            if key in record:
+                record[key] = value
+
+    return normalized
 
 
 def clean_text_fields(text: str) -> str:
@@ -32,7 +65,12 @@ def clean_text_fields(text: str) -> str:
     Returns:
         Texte nettoyé.
     """
-    pass
+    if not text:
+        return ""
+
+    if NORMALIZATION_CONFIG["normalize_spaces"]:
+        return " ".join(text.split())
+    return text.strip()
 
 
 def standardize_phone(phone: str) -> str:
@@ -48,6 +86,44 @@ def standardize_phone(phone: str) -> str:
     pass
 
 
+def _normalize_column(key: str, values: List[Any]) -> List[Any]:
+    """
+    Normalise les valeurs d'un champ pour tous les candidats.
+
+    Une colonne entièrement texte passe par les kernels Arrow ; une colonne
+    mixte (nombres, dates...) est traitée valeur par valeur.
+    """
+    if not all(value is None or isinstance(value, str) for value in values):
+        return [_normalize_value(key, value) for value in values]
+
+    column = pc.utf8_trim(pa.array(values, pa.string()), characters=_WHITESPACE)
+    if NORMALIZATION_CONFIG["normalize_spaces"]:
+        column = pc.replace_substring_regex(
+            column, pattern=f"[{_WHITESPACE}]+", replacement=" "
+        )
+    if key in NORMALIZATION_CONFIG["lowercase_fields"]:
+        # utf8_lower ne suit pas str.lower() hors ASCII (ex. "İ")
+        if not pc.all(pc.string_is_ascii(column)).as_py():
+            return [_normalize_value(key, value) for value in values]
+        column = pc.ascii_lower(column)
+
+    return column.to_pylist()
+
+
+def _normalize_value(key: str, value: Any) -> Any:
+    """Normalise une valeur d'un candidat (les non-textes sont inchangés)."""
+    if isinstance(value, str):
+        value = clean_text_fields(value)
+        if key in NORMALIZATION_CONFIG["lowercase_fields"]:
+            value = value.lower()
+    return value
+
+
+def _normalize_record(candidate: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalise un candidat (repli sans pyarrow)."""
+    return {key: _normalize_value(key, value) for key, value in candidate.items()}
+
+
 __all__ = [
     "normalize_candidate_data",
     "clean_text_fields",
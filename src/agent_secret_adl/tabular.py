@@ -0,0 +1,525 @@
+"""Lecture/écriture des fichiers tabulaires du pipeline (CSV, Parquet, Feather)."""
+
+import io
+import logging
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# Formats supportés pour les fichiers intermédiaires du pipeline
+TABLE_FORMATS = ("csv", "parquet", "feather")
+
+# Extensions reconnues -> format
+_SUFFIX_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+}
+
+# Extensions acceptées en entrée du pipeline
+TABLE_SUFFIXES = tuple(_SUFFIX_FORMATS)
+
+# Formats colonnes servis par pyarrow (Parquet zstd, Feather/Arrow IPC lz4)
+_ARROW_FORMATS = ("parquet", "feather")
+
+# Taille des blocs de lignes lus/écrits en streaming
+CHUNK_ROWS = 50_000
+
+# Options de pd.read_csv non gérées par le moteur pyarrow
+_C_ENGINE_OPTIONS = ("nrows", "chunksize", "skiprows")
+
+# Type des colonnes CSV lues en texte (as_text) : pas d'inférence par bloc
+# (tête et reste d'un fichier ont les mêmes types) et identifiants
+# conservés tels quels ("A100075", zéros non significatifs)
+_CSV_TEXT_DTYPE = pd.ArrowDtype(pa.string()) if pa is not None else str
+
+# Caractères pour lesquels to_csv (QUOTE_MINIMAL) entoure un champ de guillemets
+_CSV_SPECIAL_PATTERN = r'[,"\r\n]'
+
+
+def resolve_format(path: Union[str, Path], fmt: Optional[str] = None) -> str:
+    """
+    Détermine le format d'un fichier tabulaire.
+
+    Args:
+        path: Chemin du fichier.
+        fmt: Format explicite ("csv", "parquet" ou "feather"), sinon déduit
+            de l'extension (CSV par défaut).
+
+    Returns:
+        Format résolu.
+
+    Raises:
+        ValueError: Si le format est inconnu.
+    """
+    if fmt is None:
+        return _SUFFIX_FORMATS.get(Path(path).suffix.lower(), "csv")
+
+    fmt = fmt.lower()
+    if fmt not in TABLE_FORMATS:
+        raise ValueError(
+            f"Format inconnu : {fmt} (valeurs possibles : {', '.join(TABLE_FORMATS)})"
+        )
+    return fmt
+
+
+def read_csv(path: Union[str, Path], **kwargs) -> pd.DataFrame:
+    """
+    Charge un CSV avec le lecteur multithreadé d'Arrow si disponible.
+
+    Les colonnes sont typées Arrow (chaînes dictionnaire/UTF-8 natives,
+    valeurs manquantes = pd.NA). Sans pyarrow, ou avec une option que le
+    moteur pyarrow ne gère pas (nrows, chunksize, skiprows), retombe sur
+    le moteur C de pandas.
+
+    Args:
+        path: Chemin du fichier CSV.
+        **kwargs: Options supplémentaires passées à pd.read_csv.
+
+    Returns:
+        DataFrame chargé.
+    """
+    if pa is not None:
+        if any(option in kwargs for option in _C_ENGINE_OPTIONS):
+            return pd.read_csv(path, dtype_backend="pyarrow", **kwargs)
+        return pd.read_csv(path, engine="pyarrow", dtype_backend="pyarrow", **kwargs)
+
+    logger.debug("pyarrow non installé, lecture CSV avec le moteur C")
+    return pd.read_csv(path, **kwargs)
+
+
+def _read_csv_text(
+    path: Union[str, Path], usecols: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """Lit un CSV entier en texte avec le lecteur multithreadé d'Arrow.
+
+    Le moteur pyarrow de pd.read_csv n'applique `dtype` qu'après inférence
+    ("0078" y devient "78") : les colonnes sont ici typées dès la lecture,
+    d'après les noms de l'en-tête lus par Arrow."""
+    with pacsv.open_csv(path) as reader:
+        names = reader.schema.names
+    convert_options = pacsv.ConvertOptions(
+        column_types=dict.fromkeys(names, pa.string()), strings_can_be_null=True
+    )
+    table = pacsv.read_csv(path, convert_options=convert_options)
+    # En-têtes répétés renommés comme par le moteur C (lectures par blocs)
+    table = table.rename_columns(list(pd.read_csv(path, nrows=0).columns))
+    if usecols:
+        table = table.select(usecols)
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def write_csv(df: pd.DataFrame, path: Union[str, Path]) -> None:
+    """
+    Écrit un DataFrame en CSV avec le writer C++ d'Arrow si disponible.
+
+    Le fichier produit est identique, octet pour octet, à celui de
+    DataFrame.to_csv (guillemets seulement si nécessaire) : Arrow n'écrit
+    que les blocs où c'est garanti (colonnes texte, entières ou dates,
+    aucune valeur à entourer de guillemets), sans guillemets. Sinon, ou
+    sans pyarrow, le CSV est formaté par to_csv et écrit par blocs de
+    CHUNK_ROWS lignes, fins de ligne "\n" quelle que soit la plateforme.
+
+    Args:
+        df: DataFrame à écrire (l'index n'est pas exporté).
+        path: Chemin du fichier CSV.
+    """
+    with open(path, "wb") as f:
+        _write_csv_chunk(df, f, header=True)
+
+
+def _write_csv_chunk(df: pd.DataFrame, f, header: bool) -> None:
+    """Écrit un bloc de lignes CSV dans un fichier binaire ouvert."""
+    if pa is not None:
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            logger.debug(f"Conversion Arrow impossible ({e}), écriture pandas")
+        else:
+            if _is_plain_csv(table):
+                # En-tête écrit ici : Arrow le met toujours entre guillemets
+                if header:
+                    f.write((",".join(table.column_names) + "\n").encode("utf-8"))
+                pacsv.write_csv(
+                    table,
+                    f,
+                    write_options=pacsv.WriteOptions(
+                        include_header=False, quoting_style="none"
+                    ),
+                )
+                return
+
+    # Texte UTF-8 au-dessus du fichier binaire, détaché pour ne pas le fermer
+    text = io.TextIOWrapper(f, encoding="utf-8", newline="", write_through=True)
+    try:
+        df.to_csv(
+            text, index=False, header=header, chunksize=CHUNK_ROWS, lineterminator="\n"
+        )
+    finally:
+        text.detach()
+
+
+def _is_plain_csv(table: "pa.Table") -> bool:
+    """
+    Indique si Arrow sans guillemets écrit exactement le CSV de to_csv.
+
+    Vrai pour les colonnes texte, entières, dates ou vides (booléens,
+    flottants et horodatages sont formatés différemment par Arrow), sans
+    valeur contenant virgule, guillemet ou fin de ligne. Une table d'une
+    seule colonne est exclue : le module csv y écrit "" pour un champ vide.
+    """
+    if table.num_columns < 2 or any(
+        re.search(_CSV_SPECIAL_PATTERN, name) for name in table.column_names
+    ):
+        return False
+
+    for column in table.columns:
+        arrow_type = column.type
+        if pa.types.is_dictionary(arrow_type):
+            arrow_type = arrow_type.value_type
+            column = pa.chunked_array(
+                [chunk.dictionary for chunk in column.chunks], arrow_type
+            )
+
+        if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+            if pc.any(pc.match_substring_regex(column, _CSV_SPECIAL_PATTERN)).as_py():
+                return False
+        elif not (
+            pa.types.is_integer(arrow_type)
+            or pa.types.is_date32(arrow_type)
+            or pa.types.is_null(arrow_type)
+        ):
+            return False
+
+    return True
+
+
+def records_to_frame(
+    records: List[Dict[str, Any]], columns: List[str]
+) -> pd.DataFrame:
+    """
+    Construit un DataFrame à partir d'une liste de dictionnaires.
+
+    Avec pyarrow, les colonnes sont remplies en une passe par les builders
+    typés d'Arrow (pas d'objets Python intermédiaires, colonnes ArrowDtype).
+    Sinon, constructeur pandas classique.
+
+    Args:
+        records: Lignes (une clé par colonne).
+        columns: Colonnes à conserver, dans l'ordre.
+
+    Returns:
+        DataFrame des lignes.
+    """
+    if pa is None or not records:
+        return pd.DataFrame(records, columns=columns)
+
+    table = pa.Table.from_pylist(records).select(columns)
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def read_table(
+    path: Union[str, Path],
+    fmt: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    nrows: Optional[int] = None,
+    as_text: bool = False,
+) -> pd.DataFrame:
+    """
+    Charge un fichier du pipeline (CSV, Parquet ou Feather).
+
+    Args:
+        path: Chemin du fichier.
+        fmt: Format ("csv", "parquet" ou "feather"), déduit de l'extension si None.
+        columns: Colonnes à charger (Parquet/Feather ne lisent que celles-ci).
+        nrows: Nombre maximum de lignes lues en tête de fichier (toutes si None).
+        as_text: Lire toutes les colonnes d'un CSV en texte, sans inférence
+            de types (sans effet en Parquet/Feather, déjà typés).
+
+    Returns:
+        DataFrame chargé.
+    """
+    fmt = resolve_format(path, fmt)
+
+    if fmt in _ARROW_FORMATS:
+        _require_pyarrow(fmt)
+        if nrows is not None:
+            return _read_arrow_head(path, fmt, nrows, columns)
+        if fmt == "parquet":
+            return pd.read_parquet(path, engine="pyarrow", columns=columns)
+        return pd.read_feather(path, columns=columns)
+
+    if as_text and pa is not None and nrows is None:
+        return _read_csv_text(path, columns)
+
+    kwargs = {}
+    if columns:
+        kwargs["usecols"] = columns
+    if nrows is not None:
+        kwargs["nrows"] = nrows
+    if as_text:
+        kwargs["dtype"] = _CSV_TEXT_DTYPE
+    return read_csv(path, **kwargs)
+
+
+def write_table(
+    df: pd.DataFrame, path: Union[str, Path], fmt: Optional[str] = None
+) -> None:
+    """
+    Écrit un DataFrame du pipeline (CSV, Parquet zstd ou Feather lz4).
+
+    Args:
+        df: DataFrame à écrire (l'index n'est pas exporté).
+        path: Chemin du fichier.
+        fmt: Format ("csv", "parquet" ou "feather"), déduit de l'extension si None.
+    """
+    fmt = resolve_format(path, fmt)
+
+    if fmt == "parquet":
+        _require_pyarrow(fmt)
+        df.to_parquet(path, engine="pyarrow", compression="zstd", index=False)
+        return
+
+    if fmt == "feather":
+        _require_pyarrow(fmt)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        feather.write_feather(table, str(path), compression="lz4")
+        return
+
+    write_csv(df, path)
+
+
+def iter_table_chunks(
+    path: Union[str, Path],
+    fmt: Optional[str] = None,
+    skip_rows: int = 0,
+    chunksize: int = CHUNK_ROWS,
+    as_text: bool = False,
+) -> Iterator[pd.DataFrame]:
+    """
+    Parcourt un fichier du pipeline par blocs de lignes.
+
+    La mémoire utilisée est celle d'un bloc, pas du fichier entier.
+
+    Args:
+        path: Chemin du fichier.
+        fmt: Format ("csv", "parquet" ou "feather"), déduit de l'extension si None.
+        skip_rows: Nombre de lignes de données ignorées en tête (hors en-tête).
+        chunksize: Nombre de lignes par bloc.
+        as_text: Lire toutes les colonnes d'un CSV en texte (mêmes types
+            dans chaque bloc, comme read_table(..., as_text=True)).
+
+    Yields:
+        DataFrame de chaque bloc.
+    """
+    fmt = resolve_format(path, fmt)
+
+    if fmt in _ARROW_FORMATS:
+        _require_pyarrow(fmt)
+        offset = 0
+        for batch in _iter_record_batches(path, fmt, chunksize):
+            start = max(skip_rows - offset, 0)
+            offset += batch.num_rows
+            if start < batch.num_rows:
+                yield batch.slice(start).to_pandas()
+        return
+
+    skiprows = range(1, skip_rows + 1) if skip_rows else None
+    kwargs = {"dtype": _CSV_TEXT_DTYPE} if as_text else {}
+    with read_csv(path, skiprows=skiprows, chunksize=chunksize, **kwargs) as reader:
+        yield from reader
+
+
+@contextmanager
+def open_table_writer(
+    path: Union[str, Path], fmt: Optional[str] = None
+) -> Iterator[Callable[[pd.DataFrame], None]]:
+    """
+    Ouvre un fichier du pipeline pour une écriture par blocs.
+
+    Le premier bloc fixe l'en-tête (CSV) ou le schéma (Parquet zstd,
+    Feather lz4) ; les blocs suivants y sont ajoutés. Une colonne vide
+    dans le premier bloc (type Arrow null) est écrite en texte, pour
+    accepter les valeurs des blocs suivants.
+
+    Les blocs sont écrits dans un fichier temporaire voisin (.part),
+    renommé à la sortie du bloc `with` : le fichier de destination peut
+    donc être celui qu'on relit par blocs, et n'est pas laissé partiel en
+    cas d'échec.
+
+    Args:
+        path: Chemin du fichier.
+        fmt: Format ("csv", "parquet" ou "feather"), déduit de l'extension si None.
+
+    Yields:
+        Fonction write(df) ajoutant un bloc au fichier.
+    """
+    fmt = resolve_format(path, fmt)
+    path = Path(path)
+    part_path = path.with_name(path.name + ".part")
+
+    try:
+        with _open_chunk_writer(part_path, fmt) as write:
+            yield write
+        # Aucun bloc écrit en Parquet/Feather : pas de fichier créé
+        if part_path.exists():
+            part_path.replace(path)
+    finally:
+        part_path.unlink(missing_ok=True)
+
+
+@contextmanager
+def _open_chunk_writer(
+    path: Path, fmt: str
+) -> Iterator[Callable[[pd.DataFrame], None]]:
+    """Writer par blocs de open_table_writer, écrivant directement dans path."""
+    if fmt in _ARROW_FORMATS:
+        _require_pyarrow(fmt)
+        writer = None
+        schema = None
+
+        def write(df: pd.DataFrame) -> None:
+            nonlocal writer, schema
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if writer is None:
+                schema = _promote_null_fields(table.schema)
+                writer = _new_arrow_writer(path, fmt, schema)
+            table = table.select(schema.names).cast(schema)
+            writer.write_table(table)
+
+        try:
+            yield write
+        finally:
+            if writer is not None:
+                writer.close()
+        return
+
+    with open(path, "wb") as f:
+        first = True
+
+        def write(df: pd.DataFrame) -> None:
+            nonlocal first
+            _write_csv_chunk(df, f, header=first)
+            first = False
+
+        yield write
+
+
+def _promote_null_fields(schema: "pa.Schema") -> "pa.Schema":
+    """Remplace les colonnes de type null (aucune valeur) par du texte."""
+    return pa.schema(
+        [
+            field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+            for field in schema
+        ],
+        metadata=schema.metadata,
+    )
+
+
+def _new_arrow_writer(path: Union[str, Path], fmt: str, schema: "pa.Schema"):
+    """Crée le writer incrémental Parquet (zstd) ou Feather (lz4)."""
+    if fmt == "parquet":
+        return pq.ParquetWriter(str(path), schema, compression="zstd")
+
+    return pa.ipc.new_file(
+        str(path), schema, options=pa.ipc.IpcWriteOptions(compression="lz4")
+    )
+
+
+def _iter_record_batches(
+    path: Union[str, Path],
+    fmt: str,
+    batch_size: int,
+    columns: Optional[List[str]] = None,
+) -> Iterator["pa.RecordBatch"]:
+    """Parcourt les lots Arrow d'un Parquet ou d'un Feather (mappé en mémoire)."""
+    if fmt == "parquet":
+        with pq.ParquetFile(path) as parquet_file:
+            yield from parquet_file.iter_batches(batch_size=batch_size, columns=columns)
+        return
+
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if columns:
+                batch = batch.select(columns)
+            # Lots IPC de taille fixée à l'écriture : redécoupés (sans copie)
+            for start in range(0, batch.num_rows, batch_size):
+                yield batch.slice(start, batch_size)
+
+
+def _read_arrow_head(
+    path: Union[str, Path],
+    fmt: str,
+    nrows: int,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """Lit les nrows premières lignes d'un Parquet/Feather sans charger le
+    reste (colonnes ArrowDtype comme read_csv, colonnes dictionnaire en
+    catégories pandas comme iter_table_chunks)."""
+    batches = []
+    remaining = nrows
+    # Les lots s'arrêtent aux limites de row groups : cumuler jusqu'à nrows
+    for batch in _iter_record_batches(
+        path, fmt, min(max(nrows, 1), CHUNK_ROWS), columns
+    ):
+        if remaining <= 0:
+            break
+        batches.append(batch.slice(0, remaining))
+        remaining -= batches[-1].num_rows
+
+    if fmt == "parquet":
+        schema = pq.read_schema(path)
+    else:
+        with pa.memory_map(str(path)) as source:
+            schema = pa.ipc.open_file(source).schema
+    if columns:
+        schema = pa.schema([schema.field(name) for name in columns])
+
+    table = pa.Table.from_batches(batches, schema=schema)
+    return table.to_pandas(types_mapper=_arrow_dtype)
+
+
+def _arrow_dtype(arrow_type: "pa.DataType") -> Optional[pd.ArrowDtype]:
+    """Type pandas d'une colonne Arrow : ArrowDtype, sauf les dictionnaires
+    laissés en pd.Categorical."""
+    if pa.types.is_dictionary(arrow_type):
+        return None
+    return pd.ArrowDtype(arrow_type)
+
+
+def _require_pyarrow(fmt: str) -> None:
+    """Lève une ValueError explicite si pyarrow manque pour ce format."""
+    if pa is None:
+        raise ValueError(f"Le format {fmt} nécessite pyarrow (pip install pyarrow)")
+
+
+__all__ = [
+    "TABLE_FORMATS",
+    "TABLE_SUFFIXES",
+    "resolve_format",
+    "read_csv",
+    "write_csv",
+    "records_to_frame",
+    "read_table",
+    "write_table",
+    "iter_table_chunks",
+    "open_table_writer",
+    "CHUNK_ROWS",
+]
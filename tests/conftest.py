@@ -0,0 +1,6 @@
+"""Configuration pytest : rend le paquet importable depuis src/ sans installation."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
@@ -0,0 +1,174 @@
+"""Tests de l'extraction des admissibles depuis un PDF (extract_admissibles)."""
+
+import pytest
+
+from agent_secret_adl.extraction import extract_admissibles as extraction
+from agent_secret_adl.extraction.extract_admissibles import (
+    PDF_BACKENDS,
+    extract_admissibles_from_pdf,
+)
+from agent_secret_adl.tabular import read_table
+
+# Une liste de lignes par page, comme dans les PDF de résultats (la
+# catégorie est relue sur chaque page)
+PAGES = [
+    [
+        "RESULTATS DE L'EXAMEN",
+        "Catégorie N° candidat Prénom NOM Décision",
+        "TAXIS 100001 Jean DUPONT ADMISSIBLE",
+        "100002 Zoé BERNARD NON-ADMISSIBLE",
+        "100003 François LEFÈVRE ADMISSIBLE",
+    ],
+    ["VTC A100075 Élodie MARTIN ADMISSIBLE"],
+    [
+        "VTC 0000483789TE1 Ali BEN ALI ADMISSIBLE",
+        "100004 Marie CURIE NON-ADMISSIBLE",
+    ],
+]
+
+
+def build_pdf(pages):
+    """PDF minimal : une page par liste de lignes (Helvetica, WinAnsi)."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # arbre des pages, complété une fois les pages créées
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica"
+        b" /Encoding /WinAnsiEncoding >>",
+    ]
+    kids = []
+    for lines in pages:
+        text = "".join(
+            "({}) Tj 0 -20 Td ".format(
+                line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            )
+            for line in lines
+        )
+        stream = f"BT /F1 10 Tf 40 800 Td {text}ET".encode("cp1252")
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        )
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842]"
+            b" /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % len(objects)
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(kids),
+        len(kids),
+    )
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(pdf)
+
+
+EXPECTED_CSV = (
+    "categorie,numero_candidat,prenom,nom,decision,departement,session_date\n"
+    "TAXIS,100001,Jean,DUPONT,ADMISSIBLE,75,2024-01-15\n"
+    "TAXIS,100003,François,LEFÈVRE,ADMISSIBLE,75,2024-01-15\n"
+    "VTC,A100075,Élodie,MARTIN,ADMISSIBLE,75,2024-01-15\n"
+    "VTC,0000483789TE1,Ali,BEN ALI,ADMISSIBLE,75,2024-01-15\n"
+)
+
+
+@pytest.fixture
+def results_pdf(tmp_path):
+    path = tmp_path / "resultats.pdf"
+    path.write_bytes(build_pdf(PAGES))
+    return path
+
+
+@pytest.fixture(params=PDF_BACKENDS)
+def backend(request):
+    if request.param == "pymupdf" and extraction.pymupdf is None:
+        pytest.skip("PyMuPDF non installé")
+    return request.param
+
+
+def _extract(pdf_path, output_path, backend, num_workers=1):
+    return extract_admissibles_from_pdf(
+        str(pdf_path),
+        str(output_path),
+        departement="75",
+        session_date="2024-01-15",
+        num_workers=num_workers,
+        backend=backend,
+    )
+
+
+def test_extract_sequential(results_pdf, tmp_path, backend):
+    output = tmp_path / "admissibles.csv"
+
+    result = _extract(results_pdf, output, backend)
+
+    assert output.read_text(encoding="utf-8") == EXPECTED_CSV
+    assert result.output_path == output
+    assert result.total == 4
+    assert result.stats_by_category == {"TAXIS": 2, "VTC": 2}
+    assert list(tmp_path.glob("*.part")) == []
+
+
+def test_extract_parallel_page_ranges(results_pdf, tmp_path, backend, monkeypatch):
+    # Une page par tâche : trois plages réparties sur deux processus
+    monkeypatch.setattr(extraction, "_PAGES_PER_TASK", 1)
+    sequential = _extract(results_pdf, tmp_path / "sequentiel.csv", backend)
+    output = tmp_path / "admissibles.csv"
+
+    result = _extract(results_pdf, output, backend, num_workers=2)
+
+    assert output.read_text(encoding="utf-8") == EXPECTED_CSV
+    assert result.candidates == sequential.candidates
+
+
+def test_iter_page_candidates_keeps_page_order(results_pdf, backend, monkeypatch):
+    monkeypatch.setattr(extraction, "_PAGES_PER_TASK", 2)
+
+    pages = list(
+        extraction._iter_page_candidates(results_pdf, num_workers=2, backend=backend)
+    )
+
+    assert [parsed for parsed, _ in pages] == [3, 1, 2]
+    assert [
+        [candidate["numero_candidat"] for candidate in candidates]
+        for _, candidates in pages
+    ] == [["100001", "100003"], ["A100075"], ["0000483789TE1"]]
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_extract_to_arrow_format(results_pdf, tmp_path, backend, fmt):
+    output = tmp_path / f"admissibles.{fmt}"
+
+    result = _extract(results_pdf, output, backend)
+
+    df = read_table(output)
+    assert result.output_path == output
+    assert df["numero_candidat"].tolist() == [
+        "100001",
+        "100003",
+        "A100075",
+        "0000483789TE1",
+    ]
+    assert df["nom"].tolist()[-1] == "BEN ALI"
+
+
+def test_extract_pdf_without_candidates(tmp_path, backend):
+    pdf_path = tmp_path / "vide.pdf"
+    pdf_path.write_bytes(build_pdf([["RESULTATS DE L'EXAMEN"]]))
+    output = tmp_path / "admissibles.csv"
+
+    with pytest.raises(ValueError, match="Aucune donnée"):
+        _extract(pdf_path, output, backend)
+
+    assert not output.exists()
+    assert list(tmp_path.glob("*.part")) == []
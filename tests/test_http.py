@@ -0,0 +1,115 @@
+"""Tests de la session HTTP et du limiteur de cadence (enrichment.http)."""
+
+import pytest
+
+from agent_secret_adl.config import ENRICHMENT_CONFIG
+from agent_secret_adl.enrichment import http
+from agent_secret_adl.enrichment.http import (
+    RETRY_STATUS_CODES,
+    USER_AGENT,
+    RateLimiter,
+    build_session,
+)
+
+
+class FakeClock:
+    """Horloge monotone simulée ; sleep() note l'attente et, si demandé,
+    fait avancer l'horloge d'autant."""
+
+    def __init__(self, advance_on_sleep: bool = True):
+        self.now = 1000.0
+        self.sleeps = []
+        self.advance_on_sleep = advance_on_sleep
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        if self.advance_on_sleep:
+            self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(http.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(http.time, "sleep", fake.sleep)
+    return fake
+
+
+def test_rate_limiter_spaces_requests(clock):
+    limiter = RateLimiter(1, 2)  # 1 requête / 2 s
+
+    for _ in range(3):
+        limiter.acquire()
+
+    assert clock.sleeps == [2.0, 2.0]
+
+
+def test_rate_limiter_no_wait_after_pause(clock):
+    limiter = RateLimiter(1, 2)
+    limiter.acquire()
+
+    clock.now += 2.5
+    limiter.acquire()
+
+    assert clock.sleeps == []
+
+
+def test_rate_limiter_waits_only_for_remaining_time(clock):
+    limiter = RateLimiter(1, 2)
+    limiter.acquire()
+
+    clock.now += 0.5
+    limiter.acquire()
+
+    assert clock.sleeps == [pytest.approx(1.5)]
+
+
+def test_rate_limiter_queues_concurrent_callers(clock):
+    # Appels arrivés avant la fin des attentes (threads) : créneaux successifs
+    clock.advance_on_sleep = False
+    limiter = RateLimiter(2, 1)  # 2 requêtes / s
+
+    for _ in range(4):
+        limiter.acquire()
+
+    assert clock.sleeps == [0.5, 1.0, 1.5]
+
+
+def test_rate_limiter_burst(clock):
+    limiter = RateLimiter(1, 1, burst=3)
+
+    for _ in range(4):
+        limiter.acquire()
+
+    assert clock.sleeps == [1.0]
+
+
+def test_rate_limiter_burst_refill_is_capped(clock):
+    limiter = RateLimiter(1, 1, burst=3)
+    for _ in range(3):
+        limiter.acquire()
+
+    # Une longue pause ne rend jamais plus de `burst` jetons
+    clock.now += 60
+    for _ in range(4):
+        limiter.acquire()
+
+    assert clock.sleeps == [1.0]
+
+
+def test_build_session_retries():
+    with build_session() as session:
+        for scheme in ("https://", "http://"):
+            retry = session.get_adapter(f"{scheme}example.com").max_retries
+            assert retry.total == ENRICHMENT_CONFIG["retry_count"]
+            assert retry.backoff_factor == 0.3
+            assert set(retry.status_forcelist) == set(RETRY_STATUS_CODES)
+
+
+def test_build_session_user_agent():
+    with build_session() as session:
+        assert session.headers["User-Agent"] == USER_AGENT
+    assert USER_AGENT.startswith("agent-secret-adl/")
@@ -0,0 +1,107 @@
+"""Tests de l'enrichissement email (agent_secret_adl.enrichment.hunter)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agent_secret_adl.enrichment.hunter import (
+    _clean_email_part,
+    _clean_email_value,
+    _enrich_candidates_stub,
+    enrich_with_hunter,
+)
+
+ACCENTED_NAMES = [
+    "François",
+    "Élodie",
+    "AÏT EL DJOUDI",
+    "O'Neil",
+    "Zoé-Marie",
+    "Ñuñez",
+]
+
+
+def test_clean_email_part_folds_accents_and_punctuation():
+    cleaned = _clean_email_part(pd.Series(ACCENTED_NAMES))
+
+    assert cleaned.tolist() == [
+        "francois",
+        "elodie",
+        "aiteldjoudi",
+        "oneil",
+        "zoemarie",
+        "nunez",
+    ]
+
+
+def test_clean_email_part_matches_single_value_rule():
+    cleaned = _clean_email_part(pd.Series(ACCENTED_NAMES))
+
+    assert cleaned.tolist() == [_clean_email_value(name) for name in ACCENTED_NAMES]
+
+
+def test_clean_email_part_duplicates_keep_row_index():
+    values = pd.Series(["Ali", "Zineb", "Ali", "ALI"], index=[10, 11, 12, 15])
+
+    cleaned = _clean_email_part(values)
+
+    assert cleaned.index.tolist() == [10, 11, 12, 15]
+    assert cleaned.tolist() == ["ali", "zineb", "ali", "ali"]
+
+
+# object : lecture pandas classique ; string[pyarrow] : lecture en texte
+@pytest.mark.parametrize("dtype", [object, "string[pyarrow]"])
+def test_missing_names_set_error_status(dtype):
+    df = pd.DataFrame(
+        {
+            "prenom": pd.Series(["Zineb", None, "", "Ali", "Ali"], dtype=dtype),
+            "nom": pd.Series(
+                ["AÏT", "MARTIN", "DUPONT", np.nan, "BEN ALI"], dtype=dtype
+            ),
+        }
+    )
+
+    result = _enrich_candidates_stub(df, "k")
+
+    assert result["enrichment_status"].tolist() == [
+        "simulated",
+        "error",
+        "error",
+        "error",
+        "simulated",
+    ]
+    assert result["email"].tolist() == [
+        "zineb.ait+test@example.com",
+        None,
+        None,
+        None,
+        "ali.benali+test@example.com",
+    ]
+    assert result["enrichment_source"].tolist() == ["stub"] * 5
+
+
+def test_missing_name_column_sets_error_status():
+    df = pd.DataFrame({"prenom": ["Zineb", "Ali"]})
+
+    result = _enrich_candidates_stub(df, "k")
+
+    assert result["enrichment_status"].tolist() == ["error", "error"]
+    assert result["email"].isna().all()
+
+
+def test_enrich_with_hunter_duplicate_names(tmp_path):
+    input_csv = tmp_path / "admissibles.csv"
+    input_csv.write_text(
+        "numero_candidat,prenom,nom\n"
+        "1,Élodie,MARTIN\n"
+        "2,Élodie,MARTIN\n"
+        "3,elodie,Martin\n"
+        "4,,MARTIN\n",
+        encoding="utf-8",
+    )
+
+    df = enrich_with_hunter(str(input_csv), str(tmp_path / "out.csv"), "k", max_rows=4)
+
+    assert df["email"].tolist() == ["elodie.martin+test@example.com"] * 3 + [None]
+    assert df["enrichment_status"].tolist() == ["simulated"] * 3 + ["error"]
+    assert df.attrs["rows_skipped"] == 0
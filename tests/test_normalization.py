@@ -0,0 +1,57 @@
+"""Tests de la normalisation des candidats (agent_secret_adl.normalization)."""
+
+import pytest
+
+from agent_secret_adl import normalization
+from agent_secret_adl.normalization import normalize_candidate_data
+
+
+@pytest.fixture(params=["arrow", "python"])
+def normalize(request, monkeypatch):
+    """normalize_candidate_data avec et sans pyarrow."""
+    if request.param == "python":
+        monkeypatch.setattr(normalization, "pa", None)
+    return normalize_candidate_data
+
+
+def test_keys_missing_from_first_record_are_kept(normalize):
+    candidates = [{"nom": " A  B "}, {"nom": "C", "email": " X@Y "}]
+
+    assert normalize(candidates) == [{"nom": "A B"}, {"nom": "C", "email": "x@y"}]
+
+
+def test_unicode_whitespace_like_str_split(normalize):
+    candidates = [{"nom": "\xa0BEN  ALI　", "prenom": "\tAli\n"}]
+
+    assert normalize(candidates) == [{"nom": "BEN ALI", "prenom": "Ali"}]
+
+
+def test_non_text_values_unchanged(normalize):
+    candidates = [
+        {"numero": 527805, "nom": None, "email": "Zineb@Example.COM "},
+        {"numero": " A100075 ", "nom": "", "phone": None},
+    ]
+
+    assert normalize(candidates) == [
+        {"numero": 527805, "nom": None, "email": "zineb@example.com"},
+        {"numero": "A100075", "nom": "", "phone": None},
+    ]
+
+
+def test_non_ascii_lowercase_like_str_lower(normalize):
+    candidates = [{"email": "İLKER@EXEMPLE.FR"}]
+
+    assert normalize(candidates) == [{"email": "İLKER@EXEMPLE.FR".lower()}]
+
+
+def test_arrow_and_python_paths_agree(monkeypatch):
+    candidates = [
+        {"nom": " DUPONT\xa0\xa0Jean ", "email": " J.Dupont@Mail.FR"},
+        {"nom": "MARTIN", "phone": " 06 12 34 56 78 ", "departement": 78},
+        {"email": None, "commentaire": "ligne\r\nsuivante"},
+    ]
+    arrow = normalize_candidate_data(candidates)
+
+    monkeypatch.setattr(normalization, "pa", None)
+
+    assert arrow == normalize_candidate_data(candidates)
@@ -0,0 +1,103 @@
+"""Tests de l'enrichissement téléphones (agent_secret_adl.enrichment.phones)."""
+
+import pandas as pd
+import pytest
+
+from agent_secret_adl.enrichment import phones
+from agent_secret_adl.enrichment.phones import enrich_with_phones
+from agent_secret_adl.tabular import read_table
+
+
+class BrokenCache:
+    """Cache dont chaque accès échoue (entrée corrompue, base verrouillée)."""
+
+    def get(self, key):
+        raise OSError("database is locked")
+
+    def set(self, key, value, expire=None):
+        raise OSError("database is locked")
+
+
+@pytest.fixture
+def live_source(monkeypatch):
+    """Une source réelle unique, qui répond pour tout candidat."""
+    calls = []
+
+    def try_source(nom_complet, idx, session=None):
+        calls.append(nom_complet)
+        return {"phone": "01 23 45 67 89", "source": "SIRENE", "status": "found"}
+
+    monkeypatch.setattr(phones, "_active_sources", lambda: [("SIRENE", try_source)])
+    return calls
+
+
+def test_lookup_phone_falls_back_when_cache_fails(live_source):
+    result = phones._lookup_phone("Jean DUPONT", 0, cache=BrokenCache(), key="k")
+
+    assert result == {"phone": "01 23 45 67 89", "source": "SIRENE", "status": "found"}
+    assert live_source == ["Jean DUPONT"]
+
+
+def _baseline_stub_phone(idx: int) -> str:
+    """Formule d'origine du téléphone stub, calculée ligne à ligne."""
+    zone = ["01", "02", "03", "04", "05"][idx % 5]
+    return f"{zone} {50+idx%50:02d} {60+idx%60:02d} {70+idx%70:02d} {80+idx%80:02d}"
+
+
+def test_stub_cycle_length_and_period():
+    assert phones._STUB_PERIOD == 8400
+    assert len(phones._STUB_CYCLE) == phones._STUB_PERIOD
+    assert len(set(phones._STUB_CYCLE)) == phones._STUB_PERIOD
+
+
+@pytest.mark.parametrize("idx", [0, 1, 49, 8399, 8400, 123_457])
+def test_stub_phone_matches_original_formula(idx):
+    stub = phones._generate_phone_stub("Jean DUPONT", idx)
+
+    assert stub == {
+        "phone": _baseline_stub_phone(idx),
+        "source": "stub",
+        "status": "simulated",
+    }
+
+
+def test_vectorized_stub_phones_match_single_stub():
+    index = pd.Index([0, 7, 8399, 8400, 16_807, 123_457])
+
+    assert phones._vectorized_stub_phones(index).tolist() == [
+        _baseline_stub_phone(idx) for idx in index
+    ]
+
+
+def test_enrich_with_phones_head_and_tail(tmp_path):
+    input_csv = tmp_path / "admissibles.csv"
+    rows = [f"{100000 + i},Prenom{i},NOM{i},78" for i in range(5)]
+    input_csv.write_text(
+        "numero_candidat,prenom,nom,departement\n" + "\n".join(rows) + "\n",
+        encoding="utf-8",
+    )
+    output_csv = tmp_path / "enrichi.csv"
+
+    df = enrich_with_phones(str(input_csv), str(output_csv), max_rows=3)
+
+    assert len(df) == 3
+    assert df.attrs["rows_skipped"] == 2
+    assert df["phone"].tolist() == [_baseline_stub_phone(idx) for idx in range(3)]
+    assert df["phone_source"].tolist() == ["stub"] * 3
+    assert df["phone_status"].tolist() == ["simulated"] * 3
+
+    result = read_table(output_csv, as_text=True)
+    assert len(result) == 5
+    assert result["phone_source"].tolist() == ["stub"] * 3 + ["not_processed"] * 2
+    assert result["phone_status"].tolist() == ["simulated"] * 3 + ["skipped"] * 2
+    assert result["phone"].isna().tolist() == [False] * 3 + [True] * 2
+
+
+def test_enrich_with_phones_input_shorter_than_limit(tmp_path):
+    input_csv = tmp_path / "admissibles.csv"
+    input_csv.write_text("prenom,nom\nZineb,AIT\nAli,BEN ALI\n", encoding="utf-8")
+
+    df = enrich_with_phones(str(input_csv), str(tmp_path / "out.csv"), max_rows=50)
+
+    assert len(df) == 2
+    assert df.attrs["rows_skipped"] == 0
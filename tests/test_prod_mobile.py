@@ -0,0 +1,156 @@
+"""Tests de l'export CSV de l'enrichissement mobile."""
+
+import pandas as pd
+import pytest
+import requests
+
+from agent_secret_adl.enrichment.prod_mobile import MobileEnricher
+
+
+def test_export_csv_keeps_unquoted_format(tmp_path):
+    # Format consommé tel quel par les imports SMS/CRM : aucun guillemet
+    df_enriched = pd.DataFrame(
+        {
+            "numero_candidat": ["527805", "A100075"],
+            "prenom": ["Zineb", "Ali"],
+            "nom": ["AIT ELDJOUDI", None],
+            "categorie": ["TAXIS", "VTC"],
+            "mobile_phone_validated": ["0732512535", None],
+            "mobile_source": ["pattern_test", None],
+            "mobile_confidence": [30, 0],
+        }
+    )
+    path = tmp_path / "mobile.csv"
+
+    MobileEnricher(cache_enabled=False).export_csv(df_enriched, str(path))
+
+    assert path.read_text(encoding="utf-8") == (
+        "candidat_id,prenom,nom,categorie,mobile_phone,mobile_source,"
+        "mobile_confidence\n"
+        "527805,Zineb,AIT ELDJOUDI,TAXIS,0732512535,pattern_test,30\n"
+        "A100075,Ali,,VTC,,,0\n"
+    )
+
+
+class BrokenCache:
+    """Cache dont chaque accès échoue (entrée corrompue, base verrouillée)."""
+
+    def get(self, key):
+        raise OSError("database is locked")
+
+    def set(self, key, value, expire=None):
+        raise OSError("database is locked")
+
+
+class FakeNumverify:
+    """Session HTTP simulée : Numverify valide tout, sauf un numéro en panne."""
+
+    def __init__(self, failing_number):
+        self.failing_number = failing_number
+        self.numbers = []
+
+    def get(self, url, params=None, timeout=None):
+        self.numbers.append(params["number"])
+        if params["number"] == self.failing_number:
+            raise requests.ConnectionError("connexion réinitialisée")
+        return FakeResponse({"valid": True, "carrier": "Orange"})
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+def test_numverify_failure_only_unvalidates_that_number():
+    enricher = MobileEnricher(numverify_key="k", cache_enabled=False)
+    session = FakeNumverify(failing_number="+33611111111")
+    phones = ["06 11 11 11 11", "07 22 22 22 22", "07 22 22 22 22", None]
+
+    validated = enricher._validate_mobiles(phones, session, BrokenCache())
+
+    assert validated.tolist() == [None, "0722222222", "0722222222", None]
+    assert sorted(session.numbers) == ["+33611111111", "+33722222222"]
+
+
+@pytest.fixture
+def offline_enricher():
+    """MobileEnricher sans source web (pattern de test uniquement)."""
+    enricher = MobileEnricher(cache_enabled=False)
+    enricher._available_sources = []
+    return enricher
+
+
+CANDIDATES = pd.DataFrame(
+    {
+        "prenom": ["Zineb", "Ali", "Marie"],
+        "nom": ["AIT ELDJOUDI", "BEN ALI", "MARTIN"],
+        "departement": ["78", "78", "13"],
+    }
+)
+
+
+def test_batch_search_error_only_affects_its_row(offline_enricher, monkeypatch):
+    search_sources = offline_enricher._search_sources
+
+    def flaky_search(prenom, nom, *args):
+        if nom == "ben ali":  # forme de requête (cf. _ascii_fold)
+            raise OSError("database is locked")
+        return search_sources(prenom, nom, *args)
+
+    monkeypatch.setattr(offline_enricher, "_search_sources", flaky_search)
+
+    df = offline_enricher.search_mobile_batch(CANDIDATES)
+
+    assert df["mobile_source"].tolist() == ["pattern_test", None, "pattern_test"]
+    assert offline_enricher.stats["errors"] == 1
+    assert offline_enricher.stats["mobile_found"] == 2
+    assert offline_enricher.stats["mobile_validated"] == 2
+
+
+def test_batch_validation_error_only_affects_its_row(offline_enricher, monkeypatch):
+    rejected = offline_enricher._pattern_candidate("Ali", "BEN ALI")["raw"]
+    validate_mobile = offline_enricher._validate_mobile
+
+    def broken_batch_validation(*args, **kwargs):
+        raise OSError("database is locked")
+
+    def flaky_validation(phone, *args):
+        if phone == rejected:
+            raise OSError("database is locked")
+        return validate_mobile(phone, *args)
+
+    monkeypatch.setattr(offline_enricher, "_validate_mobiles", broken_batch_validation)
+    monkeypatch.setattr(offline_enricher, "_validate_mobile", flaky_validation)
+
+    df = offline_enricher.search_mobile_batch(CANDIDATES)
+
+    assert df["mobile_phone_validated"].notna().tolist() == [True, False, True]
+    assert df["mobile_phone_raw"].notna().tolist() == [True, False, True]
+    assert offline_enricher.stats["errors"] == 1
+    assert offline_enricher.stats["mobile_found"] == 2
+    assert offline_enricher.stats["mobile_validated"] == 2
+
+
+class FakeGoogle:
+    """Session HTTP simulée : Google CSE renvoie un snippet avec un mobile."""
+
+    def get(self, url, params=None, timeout=None):
+        return FakeResponse({"items": [{"snippet": "VTC dispo 06 12 34 56 78"}]})
+
+
+def test_google_search_ignores_unreadable_cache():
+    enricher = MobileEnricher(
+        google_cse_key="k", google_cse_id="cx", cache_enabled=False
+    )
+    enricher._google_limiter.acquire = lambda: None
+
+    mobile = enricher._try_google_dorks(
+        "Zineb", "AIT ELDJOUDI", "78", FakeGoogle(), BrokenCache()
+    )
+
+    assert mobile == "06 12 34 56 78"
@@ -0,0 +1,389 @@
+"""Tests des lectures/écritures tabulaires du pipeline (agent_secret_adl.tabular)."""
+
+import datetime
+
+import pandas as pd
+import pytest
+
+from agent_secret_adl.enrichment.hunter import enrich_with_hunter
+from agent_secret_adl.enrichment.phones import enrich_with_phones
+from agent_secret_adl.tabular import (
+    TABLE_FORMATS,
+    iter_table_chunks,
+    open_table_writer,
+    read_table,
+    resolve_format,
+    write_csv,
+    write_table,
+)
+
+ARROW_FORMATS = ["parquet", "feather"]
+
+CANDIDATES = pd.DataFrame(
+    {
+        "numero_candidat": ["527805", "A100075", "0000483789TE1"],
+        "nom": ["AIT ELDJOUDI", None, "BEN ALI"],
+        "departement": [78, 13, 2],
+        "score": [1.5, None, 30.0],
+        "commentaire": [None, None, None],
+    }
+)
+
+
+def _as_text(df: pd.DataFrame) -> list:
+    """Valeurs d'un DataFrame en texte (None si manquante), pour comparer
+    un CSV relu en chaînes à son DataFrame d'origine."""
+    return [
+        [None if pd.isna(value) else str(value) for value in row]
+        for row in df.astype(object).itertuples(index=False)
+    ]
+
+
+@pytest.mark.parametrize(
+    "path, fmt, expected",
+    [
+        ("admissibles.csv", None, "csv"),
+        ("admissibles.PARQUET", None, "parquet"),
+        ("admissibles.pq", None, "parquet"),
+        ("admissibles.feather", None, "feather"),
+        ("admissibles.txt", None, "csv"),
+        ("admissibles.csv", "Parquet", "parquet"),
+    ],
+)
+def test_resolve_format(path, fmt, expected):
+    assert resolve_format(path, fmt) == expected
+
+
+def test_resolve_format_rejects_unknown_format():
+    with pytest.raises(ValueError, match="Format inconnu"):
+        resolve_format("admissibles.csv", "xlsx")
+
+
+@pytest.mark.parametrize("fmt", ARROW_FORMATS)
+def test_arrow_round_trip_keeps_values_and_dtypes(tmp_path, fmt):
+    path = tmp_path / f"candidats.{fmt}"
+
+    write_table(CANDIDATES, path)
+    df = read_table(path)
+
+    pd.testing.assert_frame_equal(df, CANDIDATES)
+
+
+def test_csv_round_trip_infers_types_by_default(tmp_path):
+    path = tmp_path / "candidats.csv"
+
+    write_table(CANDIDATES, path)
+    df = read_table(path)
+
+    assert df.dtypes.astype(str).to_dict() == {
+        "numero_candidat": "string[pyarrow]",
+        "nom": "string[pyarrow]",
+        "departement": "int64[pyarrow]",
+        "score": "double[pyarrow]",
+        "commentaire": "null[pyarrow]",
+    }
+
+
+@pytest.mark.parametrize("nrows", [None, 3])
+def test_csv_round_trip_as_text(tmp_path, nrows):
+    path = tmp_path / "candidats.csv"
+
+    write_table(CANDIDATES, path)
+    df = read_table(path, nrows=nrows, as_text=True)
+
+    assert list(df.columns) == list(CANDIDATES.columns)
+    assert set(df.dtypes.astype(str)) == {"string[pyarrow]"}
+    assert _as_text(df) == [
+        ["527805", "AIT ELDJOUDI", "78", "1.5", None],
+        ["A100075", None, "13", None, None],
+        ["0000483789TE1", "BEN ALI", "2", "30.0", None],
+    ]
+
+
+@pytest.mark.parametrize("fmt", TABLE_FORMATS)
+def test_read_table_head_and_columns(tmp_path, fmt):
+    path = tmp_path / f"candidats.{fmt}"
+    write_table(CANDIDATES, path)
+
+    df = read_table(path, columns=["numero_candidat", "nom"], nrows=2)
+
+    assert list(df.columns) == ["numero_candidat", "nom"]
+    assert _as_text(df) == [["527805", "AIT ELDJOUDI"], ["A100075", None]]
+
+
+@pytest.mark.parametrize("fmt", TABLE_FORMATS)
+def test_iter_table_chunks_skips_head_rows(tmp_path, fmt):
+    path = tmp_path / f"candidats.{fmt}"
+    write_table(CANDIDATES, path)
+
+    chunks = list(iter_table_chunks(path, skip_rows=1, chunksize=1))
+
+    assert [len(chunk) for chunk in chunks] == [1, 1]
+    assert [chunk["numero_candidat"].iloc[0] for chunk in chunks] == [
+        "A100075",
+        "0000483789TE1",
+    ]
+
+
+@pytest.mark.parametrize("fmt", TABLE_FORMATS)
+def test_all_null_column_round_trip(tmp_path, fmt):
+    path = tmp_path / f"candidats.{fmt}"
+
+    write_table(CANDIDATES, path)
+
+    for df in (read_table(path), read_table(path, nrows=2)):
+        assert df["commentaire"].isna().all()
+    assert len(read_table(path)) == len(CANDIDATES)
+
+
+@pytest.mark.parametrize("fmt", TABLE_FORMATS)
+def test_writer_with_column_null_in_every_chunk(tmp_path, fmt):
+    path = tmp_path / f"candidats.{fmt}"
+
+    with open_table_writer(path) as write:
+        write(CANDIDATES.iloc[:2])
+        write(CANDIDATES.iloc[2:])
+    df = read_table(path)
+
+    assert df["commentaire"].isna().all()
+    assert _as_text(df[["numero_candidat"]]) == [
+        ["527805"],
+        ["A100075"],
+        ["0000483789TE1"],
+    ]
+
+
+# Tête entière et colonne vide, puis blocs où pandas infère float / objet
+DRIFTING_CHUNKS = [
+    pd.DataFrame({"departement": [78, 13], "commentaire": [None, None]}),
+    pd.DataFrame({"departement": [2.0, None], "commentaire": ["note", None]}),
+    pd.DataFrame(
+        {
+            "departement": pd.array([33, None], dtype="Int64"),
+            "commentaire": [None, None],
+        }
+    ),
+]
+
+
+def _write_chunks(path, chunks):
+    with open_table_writer(path) as write:
+        for chunk in chunks:
+            write(chunk)
+
+
+@pytest.mark.parametrize("fmt", ARROW_FORMATS)
+def test_arrow_writer_keeps_first_chunk_schema(tmp_path, fmt):
+    path = tmp_path / f"candidats.{fmt}"
+
+    _write_chunks(path, DRIFTING_CHUNKS)
+    df = read_table(path, nrows=10)
+
+    assert df.dtypes.astype(str).to_dict() == {
+        "departement": "int64[pyarrow]",
+        "commentaire": "string[pyarrow]",
+    }
+    assert _as_text(df) == [
+        ["78", None],
+        ["13", None],
+        ["2", "note"],
+        [None, None],
+        ["33", None],
+        [None, None],
+    ]
+
+
+def test_csv_writer_appends_chunks_when_inference_changes(tmp_path):
+    path = tmp_path / "candidats.csv"
+
+    _write_chunks(path, DRIFTING_CHUNKS)
+
+    # Un seul en-tête, chaque bloc formaté comme par to_csv
+    assert path.read_text(encoding="utf-8") == (
+        "departement,commentaire\n78,\n13,\n2.0,note\n,\n33,\n,\n"
+    )
+
+
+# Tête numérique / colonne vide, reste alphanumérique / renseigné
+HETEROGENEOUS_CSV = (
+    "categorie,numero_candidat,prenom,nom,decision,departement,commentaire\n"
+    "VTC,100001,Jean,DUPONT,ADMISSIBLE,78,\n"
+    "VTC,100002,Marie,MARTIN,ADMISSIBLE,78,\n"
+    "VTC,A100075,Zoe,BERNARD,ADMISSIBLE,2A,note\n"
+    "VTC,0000483789TE1,Ali,BEN ALI,ADMISSIBLE,78,x\n"
+)
+
+
+@pytest.fixture
+def heterogeneous_csv(tmp_path):
+    path = tmp_path / "admissibles.csv"
+    path.write_text(HETEROGENEOUS_CSV, encoding="utf-8")
+    return path
+
+
+def test_csv_head_and_tail_share_text_dtypes(heterogeneous_csv):
+    head = read_table(heterogeneous_csv, nrows=2, as_text=True)
+    (tail,) = iter_table_chunks(heterogeneous_csv, skip_rows=2, as_text=True)
+
+    assert head.dtypes.to_dict() == tail.dtypes.to_dict()
+    assert tail["numero_candidat"].tolist() == ["A100075", "0000483789TE1"]
+    assert head["commentaire"].isna().all()
+
+
+def test_full_csv_read_as_text_keeps_text_as_written(tmp_path):
+    # Lecture complète (lecteur Arrow) : rien n'est réinterprété en nombre
+    path = tmp_path / "admissibles.csv"
+    path.write_text("numero_candidat,departement\n0078,2.0\nA100075,\n", "utf-8")
+
+    df = read_table(path, as_text=True)
+
+    assert df["numero_candidat"].tolist() == ["0078", "A100075"]
+    assert df["departement"].iloc[0] == "2.0"
+    assert df["departement"].isna().iloc[1]
+    head = read_table(path, nrows=2, as_text=True)
+    assert head.dtypes.to_dict() == df.dtypes.to_dict()
+
+
+def test_csv_as_text_with_repeated_header(tmp_path):
+    path = tmp_path / "admissibles.csv"
+    path.write_text("nom,nom,nom.1,numero\nA,B,C,0078\n", "utf-8")
+
+    df = read_table(path, as_text=True)
+    head = read_table(path, nrows=1, as_text=True)
+
+    assert list(df.columns) == list(head.columns)
+    assert list(df.columns) == ["nom", "nom.2", "nom.1", "numero"]
+    assert df.values.tolist() == head.values.tolist() == [["A", "B", "C", "0078"]]
+    assert read_table(path, columns=["numero"], as_text=True).values.tolist() == [
+        ["0078"]
+    ]
+
+
+@pytest.mark.parametrize("fmt", ARROW_FORMATS)
+def test_arrow_chunks_follow_chunksize(tmp_path, fmt):
+    path = tmp_path / f"out.{fmt}"
+    write_table(pd.DataFrame({"numero": [str(i) for i in range(5)]}), path)
+
+    chunks = list(iter_table_chunks(path, skip_rows=1, chunksize=2))
+
+    assert [chunk["numero"].tolist() for chunk in chunks] == [
+        ["1"],
+        ["2", "3"],
+        ["4"],
+    ]
+
+
+@pytest.mark.parametrize("fmt", ARROW_FORMATS)
+def test_writer_accepts_values_in_a_column_empty_in_first_chunk(tmp_path, fmt):
+    path = tmp_path / f"out.{fmt}"
+    head = pd.DataFrame({"numero": ["1", "2"], "email": [None, None]})
+    tail = pd.DataFrame({"numero": ["A3"], "email": ["a@example.com"]})
+
+    with open_table_writer(path) as write:
+        write(head)
+        write(tail)
+
+    result = read_table(path)
+    assert result["numero"].tolist() == ["1", "2", "A3"]
+    assert result["email"].tolist()[:2] == [None, None]
+    assert result["email"].tolist()[2] == "a@example.com"
+
+
+@pytest.mark.parametrize("fmt", ARROW_FORMATS)
+@pytest.mark.parametrize("enrich", ["hunter", "phones"])
+def test_enrichment_to_arrow_with_heterogeneous_tail(
+    heterogeneous_csv, tmp_path, fmt, enrich
+):
+    output = tmp_path / f"enrichi.{fmt}"
+    if enrich == "hunter":
+        df = enrich_with_hunter(str(heterogeneous_csv), str(output), "k", max_rows=2)
+    else:
+        df = enrich_with_phones(str(heterogeneous_csv), str(output), max_rows=2)
+
+    assert df.attrs["rows_skipped"] == 2
+    result = read_table(output)
+    assert len(result) == 4
+    assert result["numero_candidat"].tolist()[2:] == ["A100075", "0000483789TE1"]
+    assert result["commentaire"].tolist()[2:] == ["note", "x"]
+
+
+@pytest.mark.parametrize("fmt", ["csv", *ARROW_FORMATS])
+@pytest.mark.parametrize("enrich", ["hunter", "phones"])
+def test_enrichment_in_place(heterogeneous_csv, tmp_path, fmt, enrich):
+    # Entrée = sortie : le reste est relu pendant l'écriture de la sortie
+    path = tmp_path / f"admissibles.{fmt}"
+    write_table(read_table(heterogeneous_csv), path)
+    if enrich == "hunter":
+        df = enrich_with_hunter(str(path), str(path), "k", max_rows=2)
+    else:
+        df = enrich_with_phones(str(path), str(path), max_rows=2)
+
+    assert df.attrs["rows_skipped"] == 2
+    result = read_table(path)
+    assert len(result) == 4
+    assert result["numero_candidat"].tolist()[2:] == ["A100075", "0000483789TE1"]
+    assert list(tmp_path.glob("*.part")) == []
+
+
+@pytest.mark.parametrize("fmt", ["csv", *ARROW_FORMATS])
+def test_failed_chunked_write_keeps_existing_file(tmp_path, fmt):
+    path = tmp_path / f"out.{fmt}"
+    write_table(pd.DataFrame({"numero": ["1"]}), path)
+    original = path.read_bytes()
+
+    with pytest.raises(RuntimeError):
+        with open_table_writer(path) as write:
+            write(pd.DataFrame({"numero": ["2"]}))
+            raise RuntimeError("échec au milieu de l'écriture")
+
+    assert path.read_bytes() == original
+    assert list(tmp_path.glob("*.part")) == []
+
+
+def _to_csv_bytes(df: pd.DataFrame) -> bytes:
+    return df.to_csv(index=False, lineterminator="\n").encode("utf-8")
+
+
+CSV_FRAMES = {
+    "pipeline": pd.DataFrame(
+        {
+            "numero_candidat": pd.array(["527805", "A100075", None], dtype="string"),
+            "prenom": ["Zineb", "Élodie", None],
+            "departement": [78, 13, 2],
+            "categorie": pd.Categorical(["TAXIS", "VTC", None]),
+            "confidence": pd.array([30, None, 85], dtype="int64[pyarrow]"),
+            "session_date": [datetime.date(2025, 2, 25)] * 3,
+        }
+    ),
+    "needs_quotes": pd.DataFrame(
+        {"nom": ["BEN ALI, Ali", 'dit "Zizou"', "ligne\nsuivante"], "n": [1, 2, 3]}
+    ),
+    "floats_bools": pd.DataFrame(
+        {"score": [1.5, 30.0, None], "ok": [True, False, True]}
+    ),
+    "single_column": pd.DataFrame({"email": ["a@example.com", "", None]}),
+    "padded_text": pd.DataFrame({"nom": [" DUPONT ", ""], "n": [1, 2]}),
+}
+
+
+@pytest.mark.parametrize("name", CSV_FRAMES)
+def test_write_csv_matches_to_csv(tmp_path, name):
+    df = CSV_FRAMES[name]
+    path = tmp_path / "out.csv"
+
+    write_csv(df, path)
+
+    assert path.read_bytes() == _to_csv_bytes(df)
+
+
+def test_chunked_csv_writer_matches_to_csv(tmp_path):
+    path = tmp_path / "out.csv"
+    head = CSV_FRAMES["padded_text"]
+    tail = pd.DataFrame({"nom": ["MARTIN, Jr"], "n": [3]})
+
+    with open_table_writer(path) as write:
+        write(head)
+        write(tail)
+
+    expected = _to_csv_bytes(pd.concat([head, tail], ignore_index=True))
+    assert path.read_bytes() == expected